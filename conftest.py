@@ -0,0 +1,23 @@
+"""
+Shared pytest setup for ``tests/`` and the root-level ``test_*.py`` scripts.
+
+On Linux the tests run on uvloop (shipped with ``uvicorn[standard]``), the
+same loop the API uses in production. ``MINDEX_URINGCORE=1`` opts into the
+io_uring based ``uringcore`` loop instead.
+"""
+import asyncio
+import os
+import sys
+
+if sys.platform == "linux":
+    try:
+        if os.environ.get("MINDEX_URINGCORE"):
+            import uringcore
+
+            asyncio.set_event_loop_policy(uringcore.EventLoopPolicy())
+        else:
+            import uvloop
+
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
@@ -140,8 +140,16 @@ CREATE TABLE IF NOT EXISTS telemetry.sample (
     created_at timestamptz NOT NULL DEFAULT now()
 );
 
-CREATE INDEX IF NOT EXISTS idx_sample_stream_recorded_at
-    ON telemetry.sample (stream_id, recorded_at DESC);
+-- Superseded by the covering idx_sample_stream_recent (0044-0044b); skip it
+-- once that exists so reruns of this file do not rebuild the old index.
+DO $$
+BEGIN
+    IF to_regclass('telemetry.idx_sample_stream_recent') IS NULL THEN
+        CREATE INDEX IF NOT EXISTS idx_sample_stream_recorded_at
+            ON telemetry.sample (stream_id, recorded_at DESC);
+    END IF;
+END
+$$;
 
 CREATE INDEX IF NOT EXISTS idx_sample_location
     ON telemetry.sample USING GIST (location);
@@ -0,0 +1,19 @@
+-- Observation statistics indexes
+-- ===============================
+-- Partial indexes matching the obs.observation filters used by
+-- scripts/query_data_volume.py and the stats router, so those counts become
+-- index-only scans over the matching rows instead of full-table scans.
+-- min/max(observed_at) is already served by idx_observation_observed_at (0003).
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_observation_has_location
+    ON obs.observation (id)
+    WHERE location IS NOT NULL;
+
+-- Predicate must be written as jsonb (not media::text) for the planner to use it
+CREATE INDEX IF NOT EXISTS idx_observation_has_media
+    ON obs.observation (id)
+    WHERE media <> '[]'::jsonb;
+
+COMMIT;
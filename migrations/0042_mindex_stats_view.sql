@@ -0,0 +1,69 @@
+-- Dashboard statistics snapshot
+-- ============================
+-- One-row materialized view holding everything scripts/query_data_volume.py
+-- reports. The numbers only move when ETL runs, so full_fungi_sync*.py
+-- refreshes it as their final step and readers do a single-row lookup.
+-- json (not jsonb) keeps the report's key order. Dropped and recreated so an
+-- edited definition takes effect when apply_migrations reruns this file.
+
+BEGIN;
+
+DROP MATERIALIZED VIEW IF EXISTS core.mindex_stats;
+
+CREATE MATERIALIZED VIEW core.mindex_stats AS
+WITH obs_summary AS (
+    SELECT count(*) AS total, count(DISTINCT taxon_id) AS taxa_observed,
+           min(observed_at) AS earliest, max(observed_at) AS latest
+    FROM obs.observation
+),
+taxa_by_source AS (
+    SELECT coalesce(json_object_agg(source, c ORDER BY c DESC), '{}'::json) AS j
+    FROM (SELECT source, count(*) AS c FROM core.taxon GROUP BY source) s
+),
+obs_by_source AS (
+    SELECT coalesce(json_object_agg(source, c ORDER BY c DESC), '{}'::json) AS j
+    FROM (SELECT source, count(*) AS c FROM obs.observation GROUP BY source) s
+),
+top_taxa AS (
+    SELECT coalesce(json_agg(json_build_object(
+        'name', canonical_name, 'common_name', common_name, 'observations', obs_count
+    ) ORDER BY obs_count DESC), '[]'::json) AS j
+    FROM (
+        -- Aggregate one column, keep the top 10, then join only those 10 rows
+        SELECT t.canonical_name, t.common_name, c.obs_count
+        FROM (
+            SELECT taxon_id, count(*) AS obs_count
+            FROM obs.observation
+            WHERE taxon_id IS NOT NULL
+            GROUP BY taxon_id
+            ORDER BY obs_count DESC
+            LIMIT 10
+        ) c
+        JOIN core.taxon t ON t.id = c.taxon_id
+    ) top
+)
+SELECT 1 AS id, json_build_object(
+    'generated_at', now(),
+    'total_taxa', (SELECT count(*) FROM core.taxon),
+    'total_external_ids', (SELECT count(*) FROM core.taxon_external_id),
+    'genome_records', (SELECT count(*) FROM bio.genome),
+    'trait_records', (SELECT count(*) FROM bio.taxon_trait),
+    'synonym_records', (SELECT count(*) FROM core.taxon_synonym),
+    'total_observations', o.total,
+    'taxa_by_source', (SELECT j FROM taxa_by_source),
+    'observations_by_source', (SELECT j FROM obs_by_source),
+    'observations_with_location',
+        (SELECT count(*) FROM obs.observation WHERE location IS NOT NULL),
+    'observations_with_images',
+        (SELECT count(*) FROM obs.observation WHERE media <> '[]'::jsonb),
+    'taxa_with_observations', o.taxa_observed,
+    'top_taxa_by_observations', (SELECT j FROM top_taxa),
+    'observation_date_range', CASE WHEN o.earliest IS NOT NULL THEN
+        json_build_object('earliest', o.earliest, 'latest', o.latest) END
+) AS stats
+FROM obs_summary o;
+
+-- REFRESH ... CONCURRENTLY needs a unique index; the view is always one row.
+CREATE UNIQUE INDEX uq_mindex_stats_id ON core.mindex_stats (id);
+
+COMMIT;
@@ -0,0 +1,4 @@
+-- Used by mindex_etl.db.prewarm_relations() after full fungi syncs. Loading
+-- pg_prewarm via shared_preload_libraries (docker-compose.yml) also enables
+-- autoprewarm, which restores the buffer cache across restarts.
+CREATE EXTENSION IF NOT EXISTS pg_prewarm;
@@ -0,0 +1,21 @@
+-- Covering index for latest-sample lookups (1/3: build)
+-- ===================================================
+-- app.v_device_latest_samples (0001) already fetches each stream's newest
+-- sample with a LATERAL ... ORDER BY recorded_at DESC LIMIT 1 probe, so it
+-- stays a per-stream index descent rather than a DISTINCT ON scan. This
+-- replaces the plain (stream_id, recorded_at DESC) index with one that also
+-- carries id, value_numeric and value_unit. Queries that only read those
+-- columns from the view (the SQL smoke test, latest-value dashboards) become
+-- index-only scans. Swapping rather than adding keeps one index to maintain
+-- per sample insert.
+--
+-- CONCURRENTLY keeps telemetry ingest unblocked but cannot run inside a
+-- transaction block, and a multi-statement file runs as one implicit
+-- transaction. So the swap is split across three files, one statement each:
+--   0044   builds the new index;
+--   0044a  stops if that build left an INVALID index behind;
+--   0044b  drops the old index.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sample_stream_recent
+    ON telemetry.sample (stream_id, recorded_at DESC)
+    INCLUDE (id, value_numeric, value_unit);
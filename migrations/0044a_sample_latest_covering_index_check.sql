@@ -0,0 +1,23 @@
+-- Covering index for latest-sample lookups (2/3: check)
+-- ===================================================
+-- A failed CREATE INDEX CONCURRENTLY leaves an INVALID index behind, and
+-- IF NOT EXISTS in 0044 would then skip it on the next run. Refuse to go on
+-- to 0044b (which drops the old index) unless the new one is valid.
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = 'telemetry'
+          AND c.relname = 'idx_sample_stream_recent'
+          AND i.indisvalid
+    ) THEN
+        RAISE EXCEPTION 'telemetry.idx_sample_stream_recent is missing or INVALID; '
+            'run DROP INDEX CONCURRENTLY IF EXISTS telemetry.idx_sample_stream_recent '
+            'and re-apply migrations';
+    END IF;
+END
+$$;
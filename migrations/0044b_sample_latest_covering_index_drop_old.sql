@@ -0,0 +1,5 @@
+-- Covering index for latest-sample lookups (3/3: drop the old index)
+-- ===================================================
+-- Only reached once 0044a has confirmed idx_sample_stream_recent is valid.
+
+DROP INDEX CONCURRENTLY IF EXISTS telemetry.idx_sample_stream_recorded_at;
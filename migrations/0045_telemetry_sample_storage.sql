@@ -0,0 +1,26 @@
+-- telemetry.sample time-series storage
+-- ====================================
+-- Samples are append-mostly and arrive roughly in recorded_at order, so:
+--   * a BRIN index on recorded_at (a few pages per million rows) lets
+--     time-window scans such as the /telemetry/summary "last 24 hours" count
+--     skip every block range outside the window;
+--   * the jsonb columns use lz4 TOAST compression, which is cheaper to write
+--     and read than the default pglz. Existing rows keep their encoding until
+--     rewritten; new rows use lz4.
+--
+-- A TimescaleDB hypertable is not used: the postgis image does not ship the
+-- extension, and a hypertable needs every unique index to include
+-- recorded_at, which would break ON CONFLICT (dedupe_key) in envelope ingest
+-- and the ledger.hypergraph_anchor.sample_id foreign key.
+
+BEGIN;
+
+CREATE INDEX IF NOT EXISTS idx_sample_recorded_at_brin
+    ON telemetry.sample USING BRIN (recorded_at) WITH (pages_per_range = 32);
+
+ALTER TABLE telemetry.sample
+    ALTER COLUMN value_json SET COMPRESSION lz4,
+    ALTER COLUMN metadata SET COMPRESSION lz4,
+    ALTER COLUMN verification_metadata SET COMPRESSION lz4;
+
+COMMIT;
@@ -22,12 +22,13 @@ Message Types:
 
 from __future__ import annotations
 
+import binascii
 import json
 import struct
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import IntEnum
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 
 class MDPMessageType(IntEnum):
@@ -41,34 +42,13 @@ class MDPMessageType(IntEnum):
     DISCOVERY = 0x07
 
 
-# CRC16-CCITT lookup table (polynomial 0x1021)
-_CRC16_TABLE: List[int] = []
-
-
-def _init_crc16_table() -> None:
-    """Initialize CRC16-CCITT lookup table."""
-    global _CRC16_TABLE
-    if _CRC16_TABLE:
-        return
-    
-    polynomial = 0x1021
-    for i in range(256):
-        crc = i << 8
-        for _ in range(8):
-            if crc & 0x8000:
-                crc = (crc << 1) ^ polynomial
-            else:
-                crc = crc << 1
-        _CRC16_TABLE.append(crc & 0xFFFF)
-
-
-_init_crc16_table()
-
-
 def crc16_ccitt(data: bytes, initial: int = 0xFFFF) -> int:
     """
     Calculate CRC16-CCITT checksum.
     
+    Polynomial 0x1021, no reflection - exactly what ``binascii.crc_hqx``
+    computes, so the table-driven loop runs in C.
+    
     Args:
         data: Bytes to checksum
         initial: Initial CRC value (default 0xFFFF)
@@ -76,10 +56,7 @@ def crc16_ccitt(data: bytes, initial: int = 0xFFFF) -> int:
     Returns:
         16-bit CRC value
     """
-    crc = initial
-    for byte in data:
-        crc = ((crc << 8) & 0xFFFF) ^ _CRC16_TABLE[((crc >> 8) ^ byte) & 0xFF]
-    return crc
+    return binascii.crc_hqx(data, initial)
 
 
 def validate_crc(payload: bytes) -> bool:
@@ -117,30 +94,17 @@ def cobs_encode(data: bytes) -> bytes:
     Returns:
         COBS-encoded data (does NOT include frame delimiters)
     """
-    if not data:
-        return b'\x01'
-    
+    # Zero-free runs are found by bytes.split (a C-level scan) and copied as
+    # slices; each run becomes 0xFF-coded 254-byte blocks plus a final block
+    # whose code is its length + 1. Same output as the byte-at-a-time encoder.
     output = bytearray()
-    code = 1
-    code_idx = len(output)
-    output.append(0) # placeholder
-    
-    for byte in data:
-        if byte == 0:
-            output[code_idx] = code
-            code = 1
-            code_idx = len(output)
-            output.append(0)
-        else:
-            output.append(byte)
-            code += 1
-            if code == 0xFF:
-                output[code_idx] = code
-                code = 1
-                code_idx = len(output)
-                output.append(0)
-    
-    output[code_idx] = code
+    for run in data.split(b'\x00'):
+        full = len(run) - len(run) % 0xFE
+        for start in range(0, full, 0xFE):
+            output.append(0xFF)
+            output += run[start:start + 0xFE]
+        output.append(len(run) - full + 1)
+        output += run[full:]
     return bytes(output)
 
 
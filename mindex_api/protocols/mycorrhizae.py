@@ -18,12 +18,27 @@ Message Formats:
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass, field
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import InitVar, dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set
+from itertools import count, islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback; same output, slower
+    orjson = None
+else:
+    # OPT_NON_STR_KEYS: payloads like {1: 2} encode as {"1": 2}, as json.dumps does
+    _ORJSON_OPTS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_UUID | orjson.OPT_NON_STR_KEYS
+
+logger = logging.getLogger(__name__)
+
 
 class ChannelType(str, Enum):
     """Mycorrhizae channel types."""
@@ -39,10 +54,16 @@ class MessageFormat(str, Enum):
     PROTOBUF = "protobuf"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MycorrhizaeMessage:
-    """A message in the Mycorrhizae Protocol."""
-    
+    """A message in the Mycorrhizae Protocol.
+
+    Slotted: one is built per publish, so there is no per-instance ``__dict__``.
+    Frozen, because its NDJSON form is cached on first use and shared by every
+    subscriber it fans out to; use ``dataclasses.replace`` for a changed copy
+    and do not mutate ``payload`` in place.
+    """
+
     id: UUID = field(default_factory=uuid4)
     channel: str = ""
     timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
@@ -60,10 +81,11 @@ class MycorrhizaeMessage:
     correlation_id: Optional[UUID] = None
     reply_to: Optional[str] = None
     ttl_seconds: int = 3600
+
+    _ndjson_cache: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
     
-    def to_ndjson(self) -> str:
-        """Serialize to NDJSON format."""
-        return json.dumps({
+    def _ndjson_dict(self) -> Dict[str, Any]:
+        return {
             "id": str(self.id),
             "channel": self.channel,
             "ts": int(self.timestamp.timestamp() * 1000),
@@ -79,12 +101,33 @@ class MycorrhizaeMessage:
                 "reply_to": self.reply_to,
                 "ttl": self.ttl_seconds,
             }
-        }, separators=(',', ':'))
+        }
+
+    def to_ndjson_bytes(self) -> bytes:
+        """Serialize to NDJSON as UTF-8 bytes, ready for a socket or file."""
+        if self._ndjson_cache is None:
+            if orjson is not None:
+                raw = orjson.dumps(self._ndjson_dict(), option=_ORJSON_OPTS)
+            else:
+                raw = json.dumps(self._ndjson_dict(), separators=(',', ':'), ensure_ascii=False).encode("utf-8")
+            object.__setattr__(self, "_ndjson_cache", raw)
+        return self._ndjson_cache
+
+    def to_ndjson(self) -> str:
+        """Serialize to NDJSON format."""
+        return self.to_ndjson_bytes().decode("utf-8")
     
     @classmethod
-    def from_ndjson(cls, line: str) -> "MycorrhizaeMessage":
-        """Deserialize from NDJSON format."""
-        data = json.loads(line.strip())
+    def from_ndjson(cls, line: str | bytes | bytearray | memoryview) -> "MycorrhizaeMessage":
+        """Deserialize from NDJSON format.
+
+        Socket/file buffers can be passed as-is: orjson parses bytes-like
+        input without first decoding it to ``str``.
+        """
+        if orjson is not None:
+            data = orjson.loads(line)
+        else:
+            data = json.loads(line.tobytes() if isinstance(line, memoryview) else line)
         
         source = data.get("source", {})
         meta = data.get("meta", {})
@@ -117,7 +160,7 @@ class MycorrhizaeMessage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MycorrhizaeChannel:
     """A channel definition in the Mycorrhizae Protocol."""
     
@@ -138,7 +181,14 @@ class MycorrhizaeChannel:
     
     # Statistics
     message_count: int = 0
-    last_message_at: Optional[datetime] = None
+    # Epoch ns from time.time_ns(); publish() stamps this on every message
+    last_message_ns: Optional[int] = None
+    # Constructor-only; reads go through the last_message_at property below
+    last_message_at: InitVar[Optional[datetime]] = None
+
+    def __post_init__(self, last_message_at: Optional[datetime]) -> None:
+        if last_message_at is not None:
+            self.last_message_ns = round(last_message_at.timestamp() * 1_000_000) * 1000
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
@@ -150,10 +200,21 @@ class MycorrhizaeChannel:
             "stream_pattern": self.stream_pattern,
             "format": self.format.value,
             "message_count": self.message_count,
-            "last_message_at": self.last_message_at.isoformat() if self.last_message_at else None,
+            "last_message_at": self.last_message_at.isoformat() if self.last_message_ns is not None else None,
         }
 
 
+def _last_message_at(self: MycorrhizaeChannel) -> Optional[datetime]:
+    """Time of the last published message (built on demand)."""
+    if self.last_message_ns is None:
+        return None
+    return datetime.fromtimestamp(self.last_message_ns / 1e9, tz=timezone.utc)
+
+
+# Set after the decorator so the dataclass still sees the last_message_at InitVar
+MycorrhizaeChannel.last_message_at = property(_last_message_at)
+
+
 # Type alias for subscription callbacks
 SubscriptionCallback = Callable[[MycorrhizaeMessage], None]
 
@@ -169,14 +230,38 @@ class MycorrhizaeProtocol:
     
     def __init__(self) -> None:
         self._channels: Dict[str, MycorrhizaeChannel] = {}
-        self._subscribers: Dict[str, List[SubscriptionCallback]] = {}
-        self._message_buffer: Dict[str, List[MycorrhizaeMessage]] = {}
+        # Per channel, subscription handle -> (callback, safe) in registration
+        # order. Guarded subscribers run inside try/except; safe ones
+        # (subscribe(..., safe=True)) promise not to raise and are called directly.
+        self._subscribers: Dict[str, Dict[int, Tuple[SubscriptionCallback, bool]]] = {}
+        self._next_handle = count(1)
+        # Per-channel ring buffers: deque(maxlen) drops the oldest on append
+        self._message_buffer: Dict[str, Deque[MycorrhizaeMessage]] = {}
+        # Everything publish() needs for a channel, behind one exact-name lookup.
+        # Subscriber tuples are rebuilt on (un)subscribe, so publish iterates a
+        # snapshot that a callback unsubscribing mid-fan-out cannot disturb.
+        self._routes: Dict[str, Tuple[
+            MycorrhizaeChannel,
+            Deque[MycorrhizaeMessage],
+            Tuple[Tuple[SubscriptionCallback, bool], ...],
+        ]] = {}
+    
+    def _update_route(self, name: str) -> None:
+        self._routes[name] = (
+            self._channels[name],
+            self._message_buffer[name],
+            tuple(self._subscribers[name].values()),
+        )
     
     def register_channel(self, channel: MycorrhizaeChannel) -> None:
         """Register a new channel."""
         self._channels[channel.name] = channel
-        self._subscribers.setdefault(channel.name, [])
-        self._message_buffer.setdefault(channel.name, [])
+        self._subscribers.setdefault(channel.name, {})
+        buffer = self._message_buffer.get(channel.name)
+        if buffer is None or buffer.maxlen != channel.buffer_size:
+            # Re-registering with a new buffer_size keeps the newest messages
+            self._message_buffer[channel.name] = deque(buffer or (), maxlen=channel.buffer_size)
+        self._update_route(channel.name)
     
     def get_channel(self, name: str) -> Optional[MycorrhizaeChannel]:
         """Get a channel by name."""
@@ -186,30 +271,45 @@ class MycorrhizaeProtocol:
         """List all registered channels."""
         return list(self._channels.values())
     
-    def subscribe(self, channel_name: str, callback: SubscriptionCallback) -> bool:
+    def subscribe(
+        self,
+        channel_name: str,
+        callback: SubscriptionCallback,
+        *,
+        safe: bool = False,
+    ) -> Optional[int]:
         """
         Subscribe to a channel.
         
         Args:
             channel_name: Name of channel to subscribe to
             callback: Function to call when messages arrive
+            safe: Callback never raises; skip the per-call exception guard
             
         Returns:
-            True if subscription successful
+            Subscription handle (a positive int) for unsubscribe, or None if
+            the channel does not exist
         """
         if channel_name not in self._channels:
-            return False
+            return None
         
-        self._subscribers[channel_name].append(callback)
-        return True
+        handle = next(self._next_handle)
+        self._subscribers[channel_name][handle] = (callback, safe)
+        self._update_route(channel_name)
+        return handle
     
-    def unsubscribe(self, channel_name: str, callback: SubscriptionCallback) -> bool:
+    def unsubscribe(
+        self,
+        channel_name: str,
+        subscription: int | SubscriptionCallback,
+    ) -> bool:
         """
         Unsubscribe from a channel.
         
         Args:
             channel_name: Name of channel
-            callback: Previously registered callback
+            subscription: Handle returned by subscribe, or the registered
+                callback itself (scans the channel's subscribers)
             
         Returns:
             True if unsubscription successful
@@ -217,11 +317,18 @@ class MycorrhizaeProtocol:
         if channel_name not in self._subscribers:
             return False
         
-        try:
-            self._subscribers[channel_name].remove(callback)
-            return True
-        except ValueError:
+        by_handle = self._subscribers[channel_name]
+        if isinstance(subscription, int):
+            handle = subscription if subscription in by_handle else None
+        else:
+            handle = next(
+                (h for h, (cb, _) in by_handle.items() if cb == subscription), None
+            )
+        if handle is None:
             return False
+        del by_handle[handle]
+        self._update_route(channel_name)
+        return True
     
     def publish(self, message: MycorrhizaeMessage) -> int:
         """
@@ -233,28 +340,32 @@ class MycorrhizaeProtocol:
         Returns:
             Number of subscribers that received the message
         """
-        channel = self._channels.get(message.channel)
-        if not channel:
+        route = self._routes.get(message.channel)
+        if route is None:
             return 0
+        channel, buffer, subscribers = route
         
         # Update channel stats
         channel.message_count += 1
-        channel.last_message_at = datetime.now(timezone.utc)
+        channel.last_message_ns = time.time_ns()
+        
+        # Dark channel (no subscribers, buffer_size=0): counted, nothing else to do
+        if not (subscribers or buffer.maxlen):
+            return 0
         
         # Buffer message
-        buffer = self._message_buffer[message.channel]
         buffer.append(message)
-        if len(buffer) > channel.buffer_size:
-            buffer.pop(0)
         
-        # Notify subscribers
-        subscribers = self._subscribers.get(message.channel, [])
-        for callback in subscribers:
+        # Notify subscribers in registration order
+        for callback, safe in subscribers:
+            if safe:
+                callback(message)
+                continue
             try:
                 callback(message)
             except Exception:
                 # Log but don't propagate subscriber errors
-                pass
+                logger.exception("Mycorrhizae subscriber failed on %s", message.channel)
         
         return len(subscribers)
     
@@ -264,8 +375,8 @@ class MycorrhizaeProtocol:
         limit: int = 50
     ) -> List[MycorrhizaeMessage]:
         """Get recent messages from a channel buffer."""
-        buffer = self._message_buffer.get(channel_name, [])
-        return buffer[-limit:]
+        buffer = self._message_buffer.get(channel_name, ())
+        return list(islice(buffer, max(0, len(buffer) - limit), None))
     
     # Pre-defined channel factories for MycoBrain integration
     @staticmethod
@@ -310,56 +421,49 @@ class MycorrhizaeProtocol:
 
 # Global protocol instance
 _protocol: Optional[MycorrhizaeProtocol] = None
+_protocol_lock = threading.Lock()
 
 
 def get_protocol() -> MycorrhizaeProtocol:
     """Get or create the global Mycorrhizae Protocol instance."""
     global _protocol
-    if _protocol is None:
-        _protocol = MycorrhizaeProtocol()
-        _init_default_channels(_protocol)
-    return _protocol
+    protocol = _protocol
+    if protocol is not None:
+        return protocol
+    # First call only: build under the lock, publish fully seeded
+    with _protocol_lock:
+        if _protocol is None:
+            protocol = MycorrhizaeProtocol()
+            _init_default_channels(protocol)
+            _protocol = protocol
+        return _protocol
 
 
-def _init_default_channels(protocol: MycorrhizaeProtocol) -> None:
-    """Initialize default channels."""
+# Channels every protocol from get_protocol() starts with: (name, type, description)
+_DEFAULT_CHANNELS = (
     # Environmental aggregate channels
-    protocol.register_channel(MycorrhizaeChannel(
-        name="aggregate.environmental",
-        channel_type=ChannelType.AGGREGATE,
-        description="All environmental sensor readings (temperature, humidity, pressure)",
-    ))
-    
-    protocol.register_channel(MycorrhizaeChannel(
-        name="aggregate.substrate",
-        channel_type=ChannelType.AGGREGATE,
-        description="Substrate and growing medium sensor readings",
-    ))
-    
+    ("aggregate.environmental", ChannelType.AGGREGATE,
+     "All environmental sensor readings (temperature, humidity, pressure)"),
+    ("aggregate.substrate", ChannelType.AGGREGATE,
+     "Substrate and growing medium sensor readings"),
     # System channels
-    protocol.register_channel(MycorrhizaeChannel(
-        name="system.device_status",
-        channel_type=ChannelType.DEVICE,
-        description="Device online/offline status changes",
-    ))
-    
-    protocol.register_channel(MycorrhizaeChannel(
-        name="system.alerts",
-        channel_type=ChannelType.COMPUTED,
-        description="System alerts and threshold violations",
-    ))
-    
+    ("system.device_status", ChannelType.DEVICE,
+     "Device online/offline status changes"),
+    ("system.alerts", ChannelType.COMPUTED,
+     "System alerts and threshold violations"),
     # Insight channels
-    protocol.register_channel(MycorrhizaeChannel(
-        name="insight.growth_prediction",
-        channel_type=ChannelType.COMPUTED,
-        description="ML-based growth rate predictions",
-    ))
-    
-    protocol.register_channel(MycorrhizaeChannel(
-        name="insight.contamination_risk",
-        channel_type=ChannelType.COMPUTED,
-        description="Contamination risk assessments",
-    ))
+    ("insight.growth_prediction", ChannelType.COMPUTED,
+     "ML-based growth rate predictions"),
+    ("insight.contamination_risk", ChannelType.COMPUTED,
+     "Contamination risk assessments"),
+)
 
 
+def _init_default_channels(protocol: MycorrhizaeProtocol) -> None:
+    """Initialize default channels."""
+    for name, channel_type, description in _DEFAULT_CHANNELS:
+        protocol.register_channel(MycorrhizaeChannel(
+            name=name,
+            channel_type=channel_type,
+            description=description,
+        ))
@@ -104,7 +104,7 @@ async def get_statistics(db: AsyncSession = Depends(get_db)):
         db,
         """
         SELECT count(*) FROM obs.observation
-        WHERE media IS NOT NULL AND media::text != '[]'
+        WHERE media <> '[]'::jsonb
         """,
     )
     stats["taxa_with_observations"] = await _scalar_count(
@@ -10,8 +10,19 @@ from psycopg.rows import dict_row
 from .config import settings
 
 
+# Server-side prepare a statement from its second execution (psycopg's
+# default waits for five). ETL jobs run the same upsert/link statements once
+# per record, so parse+plan is paid once per connection; one-off queries are
+# never prepared.
+PREPARE_THRESHOLD = 1
+
+
 def get_connection() -> Connection:
-    return psycopg.connect(settings.database_url, row_factory=dict_row)
+    return psycopg.connect(
+        settings.database_url,
+        row_factory=dict_row,
+        prepare_threshold=PREPARE_THRESHOLD,
+    )
 
 
 @contextmanager
@@ -26,3 +37,37 @@ def db_session() -> Iterator[Connection]:
     finally:
         conn.close()
 
+
+# One-row dashboard snapshot (migrations/0042_mindex_stats_view.sql)
+STATS_VIEW = "core.mindex_stats"
+
+
+def refresh_stats_view() -> None:
+    """Recompute ``core.mindex_stats``; CONCURRENTLY keeps it readable meanwhile."""
+    with db_session() as conn:
+        conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {STATS_VIEW}")
+
+
+# Hot relations for query_data_volume.py and the stats endpoints
+PREWARM_RELATIONS = (
+    "core.taxon",
+    "obs.observation",
+    "obs.idx_observation_taxon",
+    "obs.idx_observation_observed_at",
+    STATS_VIEW,
+)
+
+
+def prewarm_relations(relations=PREWARM_RELATIONS) -> dict:
+    """Load ``relations`` into shared buffers with ``pg_prewarm``; returns blocks read per relation.
+
+    Relations that do not exist are skipped. Raises if the ``pg_prewarm``
+    extension is missing (it is installed by migration 0043).
+    """
+    with db_session() as conn:
+        rows = conn.execute(
+            "SELECT r AS relation, pg_prewarm(r::regclass) AS blocks "
+            "FROM unnest(%s::text[]) AS r WHERE to_regclass(r) IS NOT NULL",
+            (list(relations),),
+        ).fetchall()
+    return {row["relation"]: row["blocks"] for row in rows}
@@ -7,11 +7,11 @@ Domain mode: "all" for all life, "fungi" for fungi-only (default).
 from __future__ import annotations
 
 import argparse
-import json
 from typing import Optional
 
 from ..config import settings
 from ..db import db_session
+from ..observation_copy import ObservationCopyWriter
 from ..sources import gbif
 from ..taxon_canonicalizer import link_external_id, upsert_taxon
 
@@ -76,6 +76,7 @@ def sync_gbif_occurrences(
 
         # Then sync occurrences
         if sync_occurrences:
+            occurrences = ObservationCopyWriter(conn, on_conflict="nothing")
             for obs in gbif.iter_gbif_occurrences(
                 max_pages=max_pages, domain_mode=mode
             ):
@@ -102,55 +103,15 @@ def sync_gbif_occurrences(
                         metadata={"source": "gbif"},
                     )
 
-                # Parse and normalize date
-                observed_at = _parse_date(obs.get("observed_at"))
-
-                with conn.cursor() as cur:
-                    lat = obs.get("lat")
-                    lng = obs.get("lng")
-
-                    cur.execute(
-                        "SELECT 1 FROM obs.observation WHERE source = %s AND source_id = %s",
-                        (obs["source"], obs["source_id"]),
-                    )
-                    if cur.fetchone():
-                        continue
-
-                    location_sql = "NULL"
-                    location_params: list[object] = []
-                    if lat is not None and lng is not None:
-                        location_sql = "ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography"
-                        location_params = [lng, lat]
-
-                    insert_sql = f"""
-                        INSERT INTO obs.observation (
-                            taxon_id, source, source_id, observer, observed_at,
-                            location, accuracy_m, media, notes, metadata
-                        )
-                        VALUES (
-                            %s, %s, %s, %s, %s::timestamptz,
-                            {location_sql}, %s, %s::jsonb, %s, %s::jsonb
-                        )
-                    """
-                    cur.execute(
-                        insert_sql,
-                        (
-                            taxon_id,
-                            obs["source"],
-                            obs["source_id"],
-                            obs.get("observer"),
-                            observed_at,
-                            *location_params,
-                            obs.get("accuracy_m"),
-                            json.dumps(obs.get("photos", [])),
-                            obs.get("notes"),
-                            json.dumps(obs.get("metadata", {})),
-                        ),
-                    )
-                    occ_inserted += 1
+                # Buffered; each 5,000-row batch is COPYed and committed together
+                written = occurrences.add(
+                    obs, taxon_id=taxon_id, observed_at=_parse_date(obs.get("observed_at"))
+                )
+                if written:
+                    occ_inserted += written
+                    print(f"GBIF: Inserted {occ_inserted} occurrences...", flush=True)
 
-                    if occ_inserted % 500 == 0:
-                        print(f"GBIF: Inserted {occ_inserted} occurrences...", flush=True)
+            occ_inserted += occurrences.flush()
 
     # Return a single number for orchestration/logging
     return species_processed + occ_inserted
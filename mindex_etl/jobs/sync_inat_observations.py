@@ -22,6 +22,7 @@ from tenacity import (
 from ..checkpoint import CheckpointManager
 from ..config import settings
 from ..db import db_session
+from ..observation_copy import ObservationCopyWriter
 from ..sources import inat
 from ..taxon_canonicalizer import upsert_taxon
 from .species_map_sync import upsert_species_map_rows
@@ -341,6 +342,7 @@ def sync_inat_observations(
     backfilled = 0
 
     with db_session() as conn:
+        observations = ObservationCopyWriter(conn, on_conflict="update")
         for obs in iter_observations(
             max_pages=max_pages,
             quality_grade=quality_grade,
@@ -367,83 +369,15 @@ def sync_inat_observations(
                 kingdom=obs.get("iconic_taxon_name"),
             )
 
-            # Insert observation
-            with conn.cursor() as cur:
-                # Create point geometry if coordinates available
-                location_sql = "NULL"
-                location_params = []
-                if obs.get("lat") and obs.get("lng"):
-                    location_sql = "ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography"
-                    location_params = [obs["lng"], obs["lat"]]
-
-                # Check if observation already exists
-                cur.execute(
-                    "SELECT 1 FROM obs.observation WHERE source = %s AND source_id = %s",
-                    (obs["source"], obs["source_id"]),
-                )
-                exists = cur.fetchone()
-
-                if exists:
-                    # Update existing
-                    update_sql = f"""
-                        UPDATE obs.observation SET
-                            taxon_id = %s,
-                            observer = %s,
-                            location = {location_sql},
-                            accuracy_m = %s,
-                            media = %s::jsonb,
-                            notes = %s,
-                            metadata = %s::jsonb
-                        WHERE source = %s AND source_id = %s
-                    """
-                    cur.execute(
-                        update_sql,
-                        (
-                            taxon_id,
-                            obs.get("observer"),
-                            *location_params,
-                            obs.get("accuracy_m"),
-                            json.dumps(obs.get("photos", [])),
-                            obs.get("notes"),
-                            json.dumps(obs.get("metadata", {})),
-                            obs["source"],
-                            obs["source_id"],
-                        ),
-                    )
-                    upsert_species_map_rows(conn, obs, core_taxon_id=taxon_id)
-                else:
-                    # Insert new
-                    insert_sql = f"""
-                        INSERT INTO obs.observation (
-                            taxon_id, source, source_id, observer, observed_at,
-                            location, accuracy_m, media, notes, metadata
-                        )
-                        VALUES (
-                            %s, %s, %s, %s, %s::timestamptz,
-                            {location_sql}, %s, %s::jsonb, %s, %s::jsonb
-                        )
-                    """
-                    cur.execute(
-                        insert_sql,
-                        (
-                            taxon_id,
-                            obs["source"],
-                            obs["source_id"],
-                            obs.get("observer"),
-                            obs.get("observed_at"),
-                            *location_params,
-                            obs.get("accuracy_m"),
-                            json.dumps(obs.get("photos", [])),
-                            obs.get("notes"),
-                            json.dumps(obs.get("metadata", {})),
-                        ),
-                    )
-                    upsert_species_map_rows(conn, obs, core_taxon_id=taxon_id)
+            # Insert or refresh via the COPY batch; species map rows stay per-row
+            observations.add(obs, taxon_id=taxon_id)
+            upsert_species_map_rows(conn, obs, core_taxon_id=taxon_id)
 
             inserted += 1
             
             # Save checkpoint periodically
             if checkpoint_manager and inserted % (100 * checkpoint_interval) == 0:
+                observations.flush()  # never checkpoint past rows still buffered
                 checkpoint_manager.save(page, records_processed=inserted)
                 print(f"Checkpoint saved: page {page}, {inserted} observations", flush=True)
             
@@ -451,6 +385,8 @@ def sync_inat_observations(
             if inserted % 100 == 0:
                 page += 1
 
+        observations.flush()
+
         if backfill_records > 0:
             backfilled = backfill_missing_inat_observation_metadata(
                 conn,
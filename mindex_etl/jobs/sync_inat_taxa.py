@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 from typing import Optional
 
 from ..checkpoint import CheckpointManager
@@ -10,44 +11,61 @@ from ..sources import inat
 from ..taxon_canonicalizer import link_external_id, upsert_taxon
 
 
-def sync_inat_taxa(
+def _write_page(conn, rows: list) -> int:
+    for taxon_payload, source, external_id in rows:
+        taxon_id = upsert_taxon(conn, **taxon_payload)
+        link_external_id(
+            conn,
+            taxon_id=taxon_id,
+            source=source,
+            external_id=external_id,
+            metadata={"source": source},
+        )
+    return len(rows)
+
+
+async def _sync_inat_taxa_async(
     *,
-    per_page: int = 100,
-    max_pages: int | None = None,
-    start_page: int = 1,
-    checkpoint_manager: Optional[CheckpointManager] = None,
-    domain_mode: Optional[str] = None,
+    per_page: int,
+    max_pages: int | None,
+    start_page: int,
+    checkpoint_manager: Optional[CheckpointManager],
+    domain_mode: str,
+    concurrency: int,
 ) -> int:
-    """Sync iNaturalist taxa with checkpoint support. domain_mode: 'all' or 'fungi' (default from config)."""
-    mode = domain_mode or settings.inat_domain_mode
     created = 0
+    page = start_page
     checkpoint_interval = 10  # Save checkpoint every 10 pages
+    # Bounded so fetches run at most a couple of windows ahead of the writer
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
     
-    with db_session() as conn:
-        page = start_page
-        for taxon_payload, source, external_id in inat.iter_inat_taxa(
-            per_page=per_page,
-            max_pages=max_pages,
-            domain_mode=mode,
-        ):
-            taxon_id = upsert_taxon(conn, **taxon_payload)
-            link_external_id(
-                conn,
-                taxon_id=taxon_id,
-                source=source,
-                external_id=external_id,
-                metadata={"source": source},
-            )
-            created += 1
-            
-            # Save checkpoint periodically
-            if checkpoint_manager and created % (per_page * checkpoint_interval) == 0:
-                checkpoint_manager.save(page, records_processed=created)
-                print(f"Checkpoint saved: page {page}, {created} records", flush=True)
-            
-            # Track current page (approximate)
-            if created % per_page == 0:
-                page += 1
+    async def produce() -> None:
+        try:
+            async for item in inat.aiter_inat_taxa_pages(
+                per_page=per_page,
+                max_pages=max_pages,
+                start_page=start_page,
+                concurrency=concurrency,
+                domain_mode=domain_mode,
+            ):
+                await queue.put(item)
+        finally:
+            await queue.put(None)
+    
+    producer = asyncio.create_task(produce())
+    try:
+        with db_session() as conn:
+            while (item := await queue.get()) is not None:
+                page, rows = item
+                # Upserts run off the event loop so the next pages keep downloading
+                created += await asyncio.to_thread(_write_page, conn, rows)
+                
+                if checkpoint_manager and (page - start_page + 1) % checkpoint_interval == 0:
+                    checkpoint_manager.save(page, records_processed=created)
+                    print(f"Checkpoint saved: page {page}, {created} records", flush=True)
+        await producer  # surface fetch errors
+    finally:
+        producer.cancel()
     
     # Final checkpoint
     if checkpoint_manager:
@@ -56,14 +74,40 @@ def sync_inat_taxa(
     return created
 
 
+def sync_inat_taxa(
+    *,
+    per_page: int = 100,
+    max_pages: int | None = None,
+    start_page: int = 1,
+    checkpoint_manager: Optional[CheckpointManager] = None,
+    domain_mode: Optional[str] = None,
+    concurrency: int = 10,
+) -> int:
+    """Sync iNaturalist taxa with checkpoint support. domain_mode: 'all' or 'fungi' (default from config).
+
+    Up to ``concurrency`` pages are fetched at once (rate limited to iNat's
+    budget) while earlier pages are being written to the database.
+    """
+    return asyncio.run(_sync_inat_taxa_async(
+        per_page=per_page,
+        max_pages=max_pages,
+        start_page=start_page,
+        checkpoint_manager=checkpoint_manager,
+        domain_mode=domain_mode or settings.inat_domain_mode,
+        concurrency=concurrency,
+    ))
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Sync iNaturalist taxa into MINDEX")
     parser.add_argument("--per-page", type=int, default=100)
     parser.add_argument("--max-pages", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=10, help="Pages fetched in parallel")
     parser.add_argument("--domain-mode", type=str, default=None, choices=["all", "fungi"],
                         help="'all' for all life, 'fungi' for fungi-only (default from config)")
     args = parser.parse_args()
-    total = sync_inat_taxa(per_page=args.per_page, max_pages=args.max_pages, domain_mode=args.domain_mode)
+    total = sync_inat_taxa(per_page=args.per_page, max_pages=args.max_pages, domain_mode=args.domain_mode,
+                           concurrency=args.concurrency)
     print(f"Synced {total} iNaturalist taxa")
 
 
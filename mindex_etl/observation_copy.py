@@ -0,0 +1,149 @@
+"""
+Bulk observation writer
+=======================
+Buffers mapped observations and writes them with ``COPY FROM STDIN`` into a
+temp staging table, then moves each batch into ``obs.observation`` with one
+``INSERT ... SELECT ... ON CONFLICT``. Replaces one INSERT round-trip per row
+in the iNaturalist / GBIF sync jobs. Points are sent as hex EWKB, which the
+geography column parses directly, so the merge runs no PostGIS constructors.
+"""
+from __future__ import annotations
+
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg import Connection
+
+STAGE_TABLE = "observation_stage"
+
+_STAGE_COLUMNS = (
+    "taxon_id", "source", "source_id", "observer", "observed_at",
+    "location", "accuracy_m", "media", "notes", "metadata",
+)
+
+# Little-endian EWKB header for a 2D Point carrying SRID 4326
+_EWKB_POINT_4326 = struct.pack("<BII", 1, 0x20000001, 4326)
+
+
+def ewkb_point(lng: Optional[float], lat: Optional[float]) -> Optional[str]:
+    """Hex EWKB for ``SRID=4326;POINT(lng lat)``, or None if either is missing."""
+    if lng is None or lat is None:
+        return None
+    return (_EWKB_POINT_4326 + struct.pack("<dd", lng, lat)).hex()
+
+
+# Temp tables skip WAL, like an UNLOGGED table, and are private to the session.
+_CREATE_STAGE_SQL = f"""
+    CREATE TEMP TABLE IF NOT EXISTS {STAGE_TABLE} (
+        taxon_id uuid,
+        source text,
+        source_id text,
+        observer text,
+        observed_at timestamptz,
+        location geography(Point, 4326),
+        accuracy_m double precision,
+        media jsonb,
+        notes text,
+        metadata jsonb
+    )
+"""
+
+_MERGE_SQL = f"""
+    INSERT INTO obs.observation (
+        taxon_id, source, source_id, observer, observed_at,
+        location, accuracy_m, media, notes, metadata
+    )
+    SELECT
+        taxon_id, source, source_id, observer, observed_at,
+        location, accuracy_m, media, notes, metadata
+    FROM {STAGE_TABLE}
+    ON CONFLICT (source, source_id) WHERE source_id IS NOT NULL
+"""
+
+_ON_CONFLICT = {
+    "nothing": "DO NOTHING",
+    "update": """DO UPDATE SET
+        taxon_id = EXCLUDED.taxon_id,
+        observer = EXCLUDED.observer,
+        location = EXCLUDED.location,
+        accuracy_m = EXCLUDED.accuracy_m,
+        media = EXCLUDED.media,
+        notes = EXCLUDED.notes,
+        metadata = EXCLUDED.metadata""",
+}
+
+
+class ObservationCopyWriter:
+    """
+    Batch mapped observations into ``obs.observation`` via COPY.
+
+    ``on_conflict="nothing"`` keeps existing rows (GBIF); ``"update"`` refreshes
+    everything except ``observed_at`` (iNaturalist). Each flush commits, so a
+    batch is its own transaction.
+    """
+
+    def __init__(self, conn: Connection, *, batch_size: int = 5000, on_conflict: str = "nothing"):
+        if on_conflict not in _ON_CONFLICT:
+            raise ValueError(f"on_conflict must be one of {sorted(_ON_CONFLICT)}")
+        self.conn = conn
+        self.batch_size = batch_size
+        self.merge_sql = f"{_MERGE_SQL} {_ON_CONFLICT[on_conflict]}"
+        # Keyed by (source, source_id): a repeated row in one batch would make
+        # ON CONFLICT DO UPDATE touch the same target twice, so the last wins.
+        # Rows without a source_id never conflict and are all kept.
+        self._rows: Dict[Tuple[str, str], tuple] = {}
+        self._unkeyed: List[tuple] = []
+        self._staged = False
+        self.written = 0
+
+    def add(self, obs: Dict[str, Any], *, taxon_id: Any, observed_at: Optional[str] = None) -> int:
+        """Buffer one mapped observation; returns rows written if this triggered a flush."""
+        row = (
+            taxon_id,
+            obs["source"],
+            obs["source_id"],
+            obs.get("observer"),
+            observed_at if observed_at is not None else obs.get("observed_at"),
+            ewkb_point(obs.get("lng"), obs.get("lat")),
+            obs.get("accuracy_m"),
+            json.dumps(obs.get("photos", [])),
+            obs.get("notes"),
+            json.dumps(obs.get("metadata", {})),
+        )
+        if obs["source_id"] is None:
+            self._unkeyed.append(row)
+        else:
+            self._rows[(obs["source"], obs["source_id"])] = row
+        if len(self._rows) + len(self._unkeyed) >= self.batch_size:
+            return self.flush()
+        return 0
+
+    def flush(self) -> int:
+        """COPY the buffered rows, merge them, commit; returns rows inserted or updated."""
+        if not self._rows and not self._unkeyed:
+            return 0
+        with self.conn.cursor() as cur:
+            if not self._staged:
+                cur.execute(_CREATE_STAGE_SQL)
+                self._staged = True
+            cur.execute(f"TRUNCATE {STAGE_TABLE}")
+            with cur.copy(f"COPY {STAGE_TABLE} ({', '.join(_STAGE_COLUMNS)}) FROM STDIN") as copy:
+                for row in self._rows.values():
+                    copy.write_row(row)
+                for row in self._unkeyed:
+                    copy.write_row(row)
+            cur.execute(self.merge_sql)
+            count = cur.rowcount
+        self.conn.commit()
+        self._rows.clear()
+        self._unkeyed.clear()
+        self.written += count
+        return count
+
+    def __enter__(self) -> "ObservationCopyWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
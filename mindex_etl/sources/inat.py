@@ -8,13 +8,14 @@ Domain mode: "all" for all life, "fungi" for fungi-only (default).
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 import re
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Generator, Optional
+from typing import AsyncIterator, Dict, Generator, List, Optional, Tuple
 
 import httpx
 from tenacity import (
@@ -26,6 +27,11 @@ from tenacity import (
 
 from ..config import settings
 
+try:
+    import orjson
+except ImportError:  # stdlib fallback
+    orjson = None
+
 # iNaturalist taxon IDs
 FUNGI_TAXON_ID = 47170  # Fungi kingdom (default when domain_mode=fungi)
 LIFE_TAXON_ID = 1  # Life (root) - use for domain_mode=all
@@ -83,6 +89,13 @@ def map_inat_taxon(record: dict) -> dict:
     }
 
 
+def _json(response: httpx.Response) -> dict:
+    """Decode a response body straight from bytes (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
 def get_auth_headers() -> dict:
     """Get authentication headers for iNaturalist API."""
     headers = {
@@ -169,7 +182,7 @@ def _fetch_page(
     else:
         response.raise_for_status()
         
-    return response.json()
+    return _json(response)
 
 
 def iter_inat_taxa(
@@ -253,6 +266,163 @@ def iter_inat_taxa(
             client.close()
 
 
+class AsyncRateLimiter:
+    """Space calls at least ``60 / requests_per_minute`` seconds apart."""
+
+    def __init__(self, requests_per_minute: float) -> None:
+        self.interval = 60.0 / requests_per_minute if requests_per_minute else 0.0
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        async with self._lock:
+            loop = asyncio.get_running_loop()
+            now = loop.time()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+
+@retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=2, min=2, max=30),
+    retry=retry_if_exception_type((httpx.HTTPStatusError, httpx.RequestError)),
+    reraise=True,
+)
+async def _fetch_page_async(
+    client: httpx.AsyncClient,
+    limiter: AsyncRateLimiter,
+    page: int,
+    per_page: int,
+    rank: str = None,
+    domain_mode: Optional[str] = None,
+) -> dict:
+    """Async counterpart of ``_fetch_page``; every attempt passes through ``limiter``."""
+    params = {
+        "taxon_id": _root_taxon_id(domain_mode),
+        "is_active": True,
+        "order_by": "observations_count",
+        "per_page": per_page,
+        "page": page,
+    }
+    if rank:
+        params["rank"] = rank
+    
+    async with limiter:
+        response = await client.get(
+            f"{settings.inat_base_url}/taxa",
+            params=params,
+            timeout=settings.http_timeout,
+            headers=get_auth_headers(),
+        )
+    
+    if response.status_code == 503:
+        response_text = response.text.lower() if response.text else ""
+        if "downtime" in response_text or "maintenance" in response_text:
+            raise ServiceDowntimeError("iNaturalist is in maintenance mode (503 downtime)")
+    elif response.status_code == 403:
+        print(f"Rate limited (403) on page {page}, waiting 10s...", flush=True)
+        await asyncio.sleep(10)
+    elif response.status_code == 429:
+        retry_after = min(int(response.headers.get("Retry-After", 30)), 60)
+        print(f"Rate limited (429) on page {page}, waiting {retry_after}s...", flush=True)
+        await asyncio.sleep(retry_after)
+    response.raise_for_status()
+    return _json(response)
+
+
+async def aiter_inat_taxa_pages(
+    *,
+    per_page: int = 200,
+    max_pages: Optional[int] = None,
+    start_page: int = 1,
+    concurrency: int = 10,
+    requests_per_minute: Optional[float] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    save_locally: bool = True,
+    rank: str = None,
+    domain_mode: Optional[str] = None,
+) -> AsyncIterator[Tuple[int, List[Tuple[Dict, str, str]]]]:
+    """
+    Yield ``(page, [(taxon, "inat", external_id), ...])`` in page order.
+
+    The first page reports ``total_results``; the remaining pages are fetched
+    ``concurrency`` at a time over one keep-alive client, with every request
+    spaced by the shared rate limiter, so a full sync is bound by iNat's
+    request budget rather than by per-request latency.
+    ``requests_per_minute`` defaults to ``60 / settings.inat_rate_limit`` and,
+    as in ``iter_inat_taxa``, ``max_pages`` counts pages from ``start_page``.
+    """
+    mode = domain_mode or getattr(settings, "inat_domain_mode", "fungi")
+    per_page = min(per_page, 200)
+    if requests_per_minute is None:
+        delay = settings.inat_rate_limit
+        requests_per_minute = 60.0 / delay if delay else 0
+    limiter = AsyncRateLimiter(requests_per_minute)
+    
+    close_client = False
+    if client is None:
+        client = httpx.AsyncClient(limits=httpx.Limits(max_keepalive_connections=concurrency))
+        close_client = True
+    
+    all_records = []
+    
+    def mapped(results: list) -> list:
+        if save_locally:
+            all_records.extend(results)
+        return [(map_inat_taxon(record), "inat", str(record.get("id"))) for record in results]
+    
+    try:
+        print(f"Fetching iNaturalist page {start_page}...", flush=True)
+        payload = await _fetch_page_async(client, limiter, start_page, per_page, rank, domain_mode=mode)
+        total_results = payload.get("total_results", 0)
+        print(f"Total results: {total_results}", flush=True)
+        results = payload.get("results", [])
+        if results:
+            yield start_page, mapped(results)
+        
+        last_page = -(-total_results // per_page) if results else 0
+        if max_pages:
+            last_page = min(last_page, start_page + max_pages - 1)
+        
+        page = start_page + 1
+        while page <= last_page:
+            window = range(page, min(page + concurrency, last_page + 1))
+            print(f"Fetching iNaturalist pages {window[0]}-{window[-1]}...", flush=True)
+            payloads = await asyncio.gather(*(
+                _fetch_page_async(client, limiter, p, per_page, rank, domain_mode=mode)
+                for p in window
+            ))
+            for p, payload in zip(window, payloads):
+                results = payload.get("results", [])
+                if not results:
+                    last_page = p - 1
+                    break
+                yield p, mapped(results)
+            page = window[-1] + 1
+        
+        if save_locally and all_records:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"inat_{mode}_{rank or 'all'}_{timestamp}.json"
+            try:
+                filepath = save_to_local(all_records, filename)
+                print(f"Saved {len(all_records)} records to {filepath}", flush=True)
+            except OSError as exc:
+                print(
+                    f"Warning: could not save iNat scrape to NAS ({exc}); taxa ingest still succeeded",
+                    flush=True,
+                )
+    
+    finally:
+        if close_client:
+            await client.aclose()
+
+
 def iter_fungi_taxa(
     *,
     per_page: int = 200,
@@ -375,7 +545,7 @@ def iter_inat_observations(
             )
             response.raise_for_status()
             
-            payload = response.json()
+            payload = _json(response)
             results = payload.get("results", [])
             
             if not results:
@@ -84,14 +84,16 @@ class MultiSourceImageFetcher:
         "x": 25,
     }
     
-    def __init__(self, timeout: float = 30.0):
+    def __init__(self, timeout: float = 30.0, limits: Optional[httpx.Limits] = None):
         self.timeout = timeout
+        self.limits = limits
         self.client: Optional[httpx.AsyncClient] = None
         self._rate_limits: Dict[str, float] = {}  # source -> last request time
         
     async def __aenter__(self):
         self.client = httpx.AsyncClient(
             timeout=self.timeout,
+            limits=self.limits or httpx.Limits(),
             headers={
                 "User-Agent": "MINDEX-ImageScraper/1.0 (Mycosoft Fungal Database; https://mycosoft.io)",
             },
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import json
 from typing import Any, Dict, Optional
 from uuid import UUID
@@ -65,6 +66,8 @@ def normalize_kingdom(
     return default
 
 
+# Names repeat heavily across a dump; errors (empty names) are not cached.
+@functools.lru_cache(maxsize=65536)
 def normalize_name(name: str) -> str:
     if not name or not name.strip():
         raise ValueError("Taxon name cannot be empty")
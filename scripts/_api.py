@@ -0,0 +1,42 @@
+"""
+Fetch MINDEX API responses from the VM and pretty-print them locally.
+
+``curl ... | python3 -m json.tool`` starts a Python interpreter on the VM just
+to indent a few KB of JSON. ``curl_json`` runs the bare ``curl`` remotely and
+formats the body here; anything that is not JSON is printed as-is.
+
+Usage (from a script in this directory):
+    from _api import curl_json
+
+    curl_json(ssh, "http://localhost:8000/api/mindex/stats", max_lines=50)
+"""
+
+from __future__ import annotations
+
+import json
+import shlex
+
+import paramiko
+
+from _ssh import exec_output
+
+
+def format_json(text: str, max_lines: int | None = None) -> str:
+    """Indent ``text`` if it parses as JSON, else return it unchanged."""
+    try:
+        text = json.dumps(json.loads(text), indent=2)
+    except ValueError:
+        pass
+    if max_lines is not None:
+        text = "\n".join(text.splitlines()[:max_lines])
+    return text
+
+
+def curl_json(ssh: paramiko.SSHClient, url: str, max_lines: int | None = None,
+              timeout: float = 60) -> str:
+    """GET ``url`` from the VM, print it formatted, and return the raw body."""
+    print(f"$ curl -s {url}\n")
+    _, raw = exec_output(ssh, f"curl -s {shlex.quote(url)}", timeout=timeout)
+    body = raw.decode("utf-8", errors="replace").strip()
+    print(format_json(body, max_lines) + "\n")
+    return body
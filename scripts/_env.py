@@ -0,0 +1,65 @@
+"""
+Per-process cache of the VM's docker environment.
+
+Several fix scripts probe ``docker-compose --version`` / ``docker compose
+version`` and list the mindex containers more than once per run. Both answers
+are stable for the life of a script, so they are fetched once per SSH client.
+
+Usage (from a script in this directory):
+    from _env import container_healthy, container_status, detect_compose
+
+    DC = detect_compose(ssh)
+    status = container_status(ssh)  # {"mindex-postgres": "Up 2 hours", ...}
+    container_healthy(ssh, "mindex-postgres")
+"""
+
+from __future__ import annotations
+
+import functools
+
+import paramiko
+
+from _ssh import exec_output
+
+
+def _exec(ssh: paramiko.SSHClient, cmd: str) -> tuple[int, str]:
+    code, raw = exec_output(ssh, cmd, timeout=30)
+    return code, raw.decode("utf-8", errors="replace")
+
+
+@functools.lru_cache(maxsize=None)
+def detect_compose(ssh: paramiko.SSHClient) -> str:
+    """Return ``"docker compose"`` if the plugin exists, else ``"docker-compose"``."""
+    code, _ = _exec(ssh, "docker compose version >/dev/null 2>&1")
+    return "docker compose" if code == 0 else "docker-compose"
+
+
+@functools.lru_cache(maxsize=None)
+def _container_status(ssh: paramiko.SSHClient) -> tuple[tuple[str, str], ...]:
+    _, out = _exec(ssh, "docker ps -a --filter name=mindex --format '{{.Names}}|{{.Status}}'")
+    rows = (line.split("|", 1) for line in out.splitlines() if "|" in line)
+    return tuple((name, status) for name, status in rows)
+
+
+def container_status(ssh: paramiko.SSHClient, refresh: bool = False) -> dict[str, str]:
+    """Return ``{container_name: status}`` for every mindex container.
+
+    Cached per client; pass ``refresh=True`` after restarting containers.
+    """
+    if refresh:
+        _container_status.cache_clear()
+    return dict(_container_status(ssh))
+
+
+def container_healthy(ssh: paramiko.SSHClient, name: str, refresh: bool = False) -> bool:
+    """True if ``name`` is up and not reported ``(unhealthy)`` / ``(health: starting)``."""
+    status = container_status(ssh, refresh=refresh).get(name, "")
+    return status.startswith("Up") and "(unhealthy)" not in status and "starting" not in status
+
+
+def print_status(ssh: paramiko.SSHClient, refresh: bool = False) -> dict[str, str]:
+    """Print ``name: status`` lines and return the mapping."""
+    status = container_status(ssh, refresh=refresh)
+    for name, state in status.items():
+        print(f"{name}: {state}")
+    return status
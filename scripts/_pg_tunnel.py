@@ -0,0 +1,116 @@
+"""
+Talk to the VM's PostgreSQL with psycopg over the existing SSH transport.
+
+``docker exec mindex-postgres psql -c ...`` pays for an SSH channel, a docker
+exec and a psql startup on every statement. ``pg_connect`` instead forwards a
+local ephemeral port through a paramiko ``direct-tcpip`` channel to the
+published container port, so a whole batch of DDL runs as ordinary
+``cursor.execute`` calls on one connection and one transaction.
+
+psycopg (libpq) cannot adopt a Python socket object, hence the local listener
+rather than a socket shim. The listener only lives for the ``with`` block:
+leaving it closes the connection and then the forwarded port.
+
+Usage (from a script in this directory):
+    from _pg_tunnel import pg_connect
+
+    with pg_connect(ssh, PG_USER, PG_DB) as conn:
+        conn.execute("CREATE SCHEMA IF NOT EXISTS obs")
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import socket
+import threading
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+import paramiko
+import psycopg
+
+logger = logging.getLogger(__name__)
+
+
+def _pump(client: socket.socket, chan: paramiko.Channel) -> None:
+    """Shuttle bytes both ways until either side closes."""
+    try:
+        while True:
+            readable, _, _ = select.select([client, chan], [], [])
+            if client in readable:
+                data = client.recv(32768)
+                if not data:
+                    break
+                chan.sendall(data)
+            if chan in readable:
+                data = chan.recv(32768)
+                if not data:
+                    break
+                client.sendall(data)
+    finally:
+        chan.close()
+        client.close()
+
+
+@contextmanager
+def forward_local_port(ssh: paramiko.SSHClient, remote_host: str = "127.0.0.1",
+                       remote_port: int = 5432) -> Iterator[int]:
+    """Listen on an ephemeral localhost port and tunnel each connection to the VM.
+
+    Yields the local port; the listener and its accept thread stop on exit.
+    A connection whose SSH channel cannot be opened is logged and closed, so
+    the client sees a reset instead of hanging.
+    """
+    transport = ssh.get_transport()
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    listener.settimeout(0.5)  # lets accept_loop notice ``stop``
+    stop = threading.Event()
+
+    def accept_loop() -> None:
+        while not stop.is_set() and transport.is_active():
+            try:
+                client, peer = listener.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            client.settimeout(None)
+            try:
+                chan = transport.open_channel("direct-tcpip", (remote_host, remote_port), peer)
+            except Exception:
+                logger.exception("tunnel to %s:%d failed", remote_host, remote_port)
+                client.close()
+                continue
+            threading.Thread(target=_pump, args=(client, chan), daemon=True).start()
+
+    thread = threading.Thread(target=accept_loop, daemon=True)
+    thread.start()
+    try:
+        yield listener.getsockname()[1]
+    finally:
+        stop.set()
+        thread.join()
+        listener.close()
+
+
+@contextmanager
+def pg_connect(ssh: paramiko.SSHClient, user: str, dbname: str, password: str | None = None,
+               remote_port: int = 5432, **kwargs: Any) -> Iterator[psycopg.Connection]:
+    """Connect to ``dbname`` on the VM through ``ssh`` for the ``with`` block.
+
+    Like ``with psycopg.connect(...)``: commits on a clean exit, then closes
+    the connection and the forwarded port. ``password`` defaults to
+    ``$PG_PASSWORD``; the published port goes through docker's proxy, so the
+    container's local ``trust`` rule does not apply.
+    """
+    if password is None:
+        password = os.environ.get("PG_PASSWORD", "")
+    with forward_local_port(ssh, remote_port=remote_port) as port:
+        with psycopg.connect(
+            host="127.0.0.1", port=port, user=user, dbname=dbname, password=password, **kwargs
+        ) as conn:
+            yield conn
@@ -0,0 +1,48 @@
+"""
+Ship a SQL script to the VM once and run it with ``psql -f``.
+
+Inlining SQL into ``psql -c "..."`` or a heredoc nests it inside a Python
+f-string and a shell string, which forces ``'{{}}'`` escaping for jsonb
+defaults and makes the shell re-parse the whole script. ``psql_file`` writes
+the plain SQL over SFTP to a fresh ``mktemp`` file, yields the single command
+that feeds it to ``psql`` in the container, and removes the file afterwards,
+so concurrent runs do not collide and no SQL is left behind on the VM.
+
+Usage (from a script in this directory):
+    from _psql import psql_file
+
+    with psql_file(ssh, SQL, PG_USER, PG_DB) as cmd:
+        run(ssh, cmd)
+"""
+
+from __future__ import annotations
+
+import io
+import shlex
+from contextlib import contextmanager
+from typing import Iterator
+
+import paramiko
+
+from _ssh import exec_output
+
+
+@contextmanager
+def psql_file(ssh: paramiko.SSHClient, sql: str, user: str, dbname: str,
+              container: str = "mindex-postgres", on_error_stop: bool = False) -> Iterator[str]:
+    """Upload ``sql`` to a temp file on the VM; yield the host command that runs it."""
+    code, out = exec_output(ssh, "mktemp /tmp/mindex_sql.XXXXXX", timeout=30)
+    path = out.decode("utf-8", errors="replace").strip()
+    if code != 0 or not path:
+        raise RuntimeError(f"mktemp failed on the VM ({code}): {path}")
+    quoted = shlex.quote(path)
+    try:
+        with ssh.open_sftp() as sftp:
+            sftp.putfo(io.BytesIO(sql.encode("utf-8")), path)
+        # Fed over stdin, so no copy of the file is left inside the container
+        yield (
+            f"docker exec -i {container} psql -U {user} -d {dbname} "
+            f"-v ON_ERROR_STOP={int(on_error_stop)} -f - < {quoted} 2>&1"
+        )
+    finally:
+        exec_output(ssh, f"rm -f {quoted}", timeout=30)
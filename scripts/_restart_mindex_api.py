@@ -1,20 +1,26 @@
 #!/usr/bin/env python3
 """Restart MINDEX API with rebuilt image - connect to existing DB containers"""
-import paramiko
 import os
+import socket
 import time
 
+from _ssh import connect
+
 VM_IP = "192.168.0.189"
 VM_USER = "mycosoft"
 VM_PASS = os.environ.get("VM_PASSWORD", "")
 MINDEX_DB_PASSWORD = os.environ.get("MINDEX_DB_PASSWORD", "")
 
-def run_cmd(ssh, cmd, timeout=600, show=True):
+def run_cmd(ssh, cmd, timeout=600, show=True, tail=30):
+    # Truncate on the VM so discarded output never crosses the wire. tail (not
+    # head) reads to EOF, so the command is never cut short by SIGPIPE.
+    if show and tail:
+        cmd = f"({cmd}) 2>&1 | tail -n {tail}"
     stdin, stdout, stderr = ssh.exec_command(cmd, timeout=timeout)
     output = stdout.read().decode('utf-8', errors='ignore')
     error = stderr.read().decode('utf-8', errors='ignore')
     if show:
-        for line in (output + error).strip().split('\n')[:30]:
+        for line in (output + error).strip().split('\n'):
             if line.strip():
                 print(f"  {line}")
     return output + error
@@ -23,10 +29,8 @@ print("=" * 70)
 print("MINDEX API RESTART")
 print("=" * 70)
 
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 print("\n[1] Connecting to MINDEX VM...")
-ssh.connect(VM_IP, username=VM_USER, password=VM_PASS, timeout=30)
+ssh = connect(VM_IP, VM_USER, VM_PASS)
 print("  Connected")
 
 print("\n[2] Pulling latest code...")
@@ -37,8 +41,18 @@ run_cmd(ssh, "docker rm -f mindex-api 2>/dev/null; true", show=False)
 print("  Cleaned up")
 
 print("\n[4] Building new image...")
-output = run_cmd(ssh, "cd /home/mycosoft/mindex && docker build -t mindex-api:latest -f Dockerfile --no-cache . 2>&1 | tail -10", timeout=600)
-print("  Build complete")
+# Images are labelled with the commit they were built from; skip the build when
+# the checkout has not moved. Layer cache is kept so pip/apt layers are reused.
+probe = run_cmd(ssh, "cd /home/mycosoft/mindex && git rev-parse HEAD && "
+                     "(docker inspect --format '{{index .Config.Labels \"git_sha\"}}' mindex-api:latest 2>/dev/null || true)",
+                show=False).split()
+head_sha = probe[0] if probe else ""
+image_sha = probe[1] if len(probe) > 1 else ""
+if head_sha and head_sha == image_sha:
+    print(f"  Image already built from {head_sha[:12]}, skipping build")
+else:
+    output = run_cmd(ssh, f"cd /home/mycosoft/mindex && docker build -t mindex-api:latest -f Dockerfile --label git_sha={head_sha} . 2>&1 | tail -10", timeout=600)
+    print("  Build complete")
 
 print("\n[5] Get network name...")
 output = run_cmd(ssh, "docker network ls --filter name=mindex --format '{{.Name}}'")
@@ -46,13 +60,13 @@ network = output.strip().split('\n')[0] if output.strip() else "bridge"
 print(f"  Using network: {network}")
 
 print("\n[5b] Free port 8000 (kill host uvicorn if any)...")
-pids_out = run_cmd(ssh, "fuser 8000/tcp 2>/dev/null || true", show=False)
-pids = " ".join(p for p in pids_out.strip().split() if p.isdigit())
-if pids:
-    run_cmd(ssh, "kill -9 " + pids + " 2>/dev/null; true", show=False)
-run_cmd(ssh, "fuser -k 8000/tcp 2>/dev/null; true", show=False)
-run_cmd(ssh, "echo '%s' | sudo -S fuser -k 8000/tcp 2>/dev/null; true" % VM_PASS.replace("'", "'\"'\"'"), show=False)
-time.sleep(2)
+# One round-trip; only escalate to sudo if the port is still bound afterwards.
+still_bound = run_cmd(ssh, "pids=$(fuser 8000/tcp 2>/dev/null); "
+                           "[ -n \"$pids\" ] && kill -9 $pids 2>/dev/null; "
+                           "fuser -k 8000/tcp >/dev/null 2>&1; "
+                           "ss -Hltn 'sport = :8000' | grep -q . && echo bound; true", show=False)
+if "bound" in still_bound:
+    run_cmd(ssh, "echo '%s' | sudo -S fuser -k 8000/tcp 2>/dev/null; true" % VM_PASS.replace("'", "'\"'\"'"), show=False)
 
 print("\n[6] Starting API container connected to existing infra...")
 db_pass_escaped = MINDEX_DB_PASSWORD.replace("'", "'\"'\"'")
@@ -70,16 +84,41 @@ run_cmd(ssh, f"""docker run -d \\
     mindex-api:latest 2>&1""")
 print("  Container started")
 
-print("\n[7] Waiting 15s for startup...")
-time.sleep(15)
+print("\n[7] Streaming container logs until healthy (max 60s)...")
+# Follow the logs on a non-blocking channel and stop as soon as /health answers,
+# instead of sleeping a fixed 15s and reading a tail afterwards.
+log_chan = ssh.get_transport().open_session()
+log_chan.exec_command("docker logs -f --tail 15 mindex-api 2>&1")
+log_chan.settimeout(0.1)
+pending = b""
+healthy = False
+deadline = time.monotonic() + 60
+next_probe = time.monotonic() + 1
+while time.monotonic() < deadline:
+    try:
+        data = log_chan.recv(4096)
+        if not data:
+            break
+        pending += data
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            if line.strip():
+                print(f"  {line.decode('utf-8', errors='ignore')}")
+    except socket.timeout:
+        pass
+    if time.monotonic() >= next_probe:
+        next_probe = time.monotonic() + 1
+        code = run_cmd(ssh, "curl -s -o /dev/null -w '%{http_code}' http://localhost:8000/api/mindex/health", show=False)
+        if code.strip() == "200":
+            healthy = True
+            break
+log_chan.close()
+print("  API healthy" if healthy else "  API not healthy yet")
 
 print("\n[8] Checking container status...")
 output = run_cmd(ssh, "docker ps --filter name=mindex-api --format '{{.Names}}: {{.Status}}'")
 
-print("\n[9] Container logs...")
-output = run_cmd(ssh, "docker logs mindex-api --tail 15 2>&1")
-
-print("\n[10] Testing health endpoint...")
+print("\n[9] Testing health endpoint...")
 output = run_cmd(ssh, "curl -s http://localhost:8000/api/mindex/health 2>&1")
 
 ssh.close()
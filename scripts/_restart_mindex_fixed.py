@@ -1,19 +1,24 @@
 #!/usr/bin/env python3
 """Restart MINDEX with correct environment variables"""
-import paramiko
 import os
 import time
 
+from _ssh import connect
+
 VM_IP = "192.168.0.189"
 VM_USER = "mycosoft"
 VM_PASS = os.environ.get("VM_PASSWORD", "")
 
-def run_cmd(ssh, cmd, timeout=600, show=True):
+def run_cmd(ssh, cmd, timeout=600, show=True, tail=40):
+    # Truncate on the VM so discarded output never crosses the wire. tail (not
+    # head) reads to EOF, so the command is never cut short by SIGPIPE.
+    if show and tail:
+        cmd = f"({cmd}) 2>&1 | tail -n {tail}"
     stdin, stdout, stderr = ssh.exec_command(cmd, timeout=timeout)
     output = stdout.read().decode('utf-8', errors='ignore')
     error = stderr.read().decode('utf-8', errors='ignore')
     if show:
-        for line in (output + error).strip().split('\n')[:40]:
+        for line in (output + error).strip().split('\n'):
             if line.strip():
                 print(f"  {line}")
     return output + error
@@ -22,10 +27,8 @@ print("=" * 70)
 print("RESTART MINDEX WITH CORRECT CONFIG")
 print("=" * 70)
 
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 print("\n[1] Connecting...")
-ssh.connect(VM_IP, username=VM_USER, password=VM_PASS, timeout=30)
+ssh = connect(VM_IP, VM_USER, VM_PASS)
 
 print("\n[2] Remove stale container...")
 run_cmd(ssh, "docker stop mindex-api 2>/dev/null; docker rm mindex-api 2>/dev/null; echo 'Done'", show=False)
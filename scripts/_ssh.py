@@ -0,0 +1,123 @@
+"""
+Shared paramiko connection setup for the VM maintenance scripts.
+
+The scripts in this directory all talk to known Mycosoft VMs, so there is no
+reason to let paramiko offer (and occasionally negotiate) the slow
+finite-field Diffie-Hellman groups or RSA host keys. ``connect`` centralises
+the ``SSHClient`` boilerplate with those algorithms disabled.
+
+``exec_output`` runs one command and drains its output while it runs, so a
+chatty command (``docker logs``, ``psql \\d``) never stalls on a full SSH
+window waiting for a reader. ``exec_streams`` does the same but keeps stdout
+and stderr apart.
+
+Usage (from a script in this directory):
+    from _ssh import connect, exec_output, exec_streams
+
+    ssh = connect(VM_HOST, VM_USER, VM_PASS)
+    code, out = exec_output(ssh, "docker logs mindex-api --tail 50")
+    code, out = exec_output(ssh, "docker exec -i mindex-postgres psql", stdin=sql_bytes)
+    code, out, err = exec_streams(ssh, "docker exec mindex-postgres psql -c '\\dt'")
+"""
+
+from __future__ import annotations
+
+import select
+import time
+from typing import Any
+
+import paramiko
+
+
+# Every RSA variant (host keys and signatures) and every finite-field DH kex
+# paramiko knows. Curve25519 / ECDH kex and Ed25519 / ECDSA host keys, which
+# OpenSSH generates by default, remain enabled.
+DISABLED_ALGORITHMS = {
+    "pubkeys": ["ssh-rsa", "rsa-sha2-256", "rsa-sha2-512"],
+    "keys": ["ssh-rsa", "rsa-sha2-256", "rsa-sha2-512"],
+    "kex": [
+        "diffie-hellman-group1-sha1",
+        "diffie-hellman-group14-sha1",
+        "diffie-hellman-group14-sha256",
+        "diffie-hellman-group16-sha512",
+        "diffie-hellman-group18-sha512",
+        "diffie-hellman-group-exchange-sha1",
+        "diffie-hellman-group-exchange-sha256",
+    ],
+}
+
+
+def connect(host: str, user: str, password: str, timeout: float = 30, **kwargs: Any) -> paramiko.SSHClient:
+    """Open an ``SSHClient`` to ``host`` with password auth and fast algorithms."""
+    ssh = paramiko.SSHClient()
+    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+    options: dict[str, Any] = {
+        "look_for_keys": False,
+        "allow_agent": False,
+        "banner_timeout": 10,
+        "disabled_algorithms": DISABLED_ALGORITHMS,
+    }
+    options.update(kwargs)
+    ssh.connect(host, username=user, password=password, timeout=timeout, **options)
+    return ssh
+
+
+def exec_output(ssh: paramiko.SSHClient, cmd: str, timeout: float = 120,
+                stdin: bytes | None = None) -> tuple[int, bytes]:
+    """Run ``cmd`` without a PTY; return ``(exit_code, stdout+stderr)``.
+
+    Output is read as it arrives rather than after ``recv_exit_status()``, and
+    stderr is folded into stdout so neither buffer can fill unread. ``stdin``
+    bytes (e.g. a local SQL file) are sent down the channel, then EOF.
+    """
+    chan = ssh.get_transport().open_session(timeout=timeout)
+    chan.set_combine_stderr(True)
+    chan.settimeout(timeout)
+    chan.exec_command(cmd)
+    if stdin is not None:
+        chan.sendall(stdin)
+    chan.shutdown_write()
+    deadline = time.monotonic() + timeout
+    buf = bytearray()
+    while True:
+        chunk = chan.recv(32768)
+        if not chunk:
+            break
+        buf += chunk
+        if time.monotonic() > deadline:
+            chan.close()
+            raise TimeoutError(f"Command timed out: {cmd[:80]}")
+    return chan.recv_exit_status(), bytes(buf)
+
+
+def exec_streams(ssh: paramiko.SSHClient, cmd: str, timeout: float = 120,
+                 stdin: bytes | None = None) -> tuple[int, bytes, bytes]:
+    """Run ``cmd`` without a PTY; return ``(exit_code, stdout, stderr)``.
+
+    Both streams are drained as data arrives (``select`` on the channel), so
+    a command writing heavily to stderr cannot fill its window and block
+    while we wait on stdout, and the call returns as soon as the remote
+    process exits and closes its output.
+    """
+    chan = ssh.get_transport().open_session(timeout=timeout)
+    chan.settimeout(timeout)
+    chan.exec_command(cmd)
+    if stdin is not None:
+        chan.sendall(stdin)
+    chan.shutdown_write()
+    deadline = time.monotonic() + timeout
+    out, err = bytearray(), bytearray()
+    while True:
+        while chan.recv_ready():
+            out += chan.recv(65536)
+        while chan.recv_stderr_ready():
+            err += chan.recv_stderr(65536)
+        if chan.exit_status_ready() and chan.eof_received \
+                and not chan.recv_ready() and not chan.recv_stderr_ready():
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            chan.close()
+            raise TimeoutError(f"Command timed out: {cmd[:80]}")
+        select.select([chan], [], [], min(remaining, 1.0))
+    return chan.recv_exit_status(), bytes(out), bytes(err)
@@ -0,0 +1,65 @@
+"""
+Run remote commands through the system ``ssh`` with ControlMaster multiplexing.
+
+Paramiko's key exchange and auth run in Python on every process start, which
+dominates one-shot CLI scripts like ``tail_etl_vm_189.py``. OpenSSH keeps a
+master connection behind a control socket for ``CONTROL_PERSIST`` seconds, so
+repeat invocations (and several commands in one run) open a channel on it
+in a few milliseconds instead of handshaking again.
+
+The first connection authenticates with whatever ``ssh`` would use (agent,
+keys). If ``VM_PASSWORD`` is set and ``sshpass`` is installed, it is fed to
+that first login through the environment, never the command line.
+
+Usage (from a script in this directory):
+    from _ssh_mux import ssh_run
+
+    code, out = ssh_run(VM_HOST, VM_USER, "tail -100 etl.log")
+    code, out = ssh_run(VM_HOST, VM_USER, "cat > /tmp/x", stdin=b"...")
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+
+CONTROL_PERSIST = 600
+# Control sockets live in the user's 0700 ~/.ssh, never a shared directory
+# like /tmp: whoever owns the socket receives every command sent through it.
+CONTROL_DIR = Path.home() / ".ssh"
+
+
+def ssh_command(host: str, user: str) -> list[str]:
+    """Return the ``ssh`` argv prefix for ``user@host`` on a shared control socket."""
+    CONTROL_DIR.mkdir(mode=0o700, exist_ok=True)
+    argv = [
+        "ssh",
+        "-o", "ControlMaster=auto",
+        "-o", f"ControlPath={CONTROL_DIR}/cm-%C",
+        "-o", f"ControlPersist={CONTROL_PERSIST}",
+        "-o", "StrictHostKeyChecking=accept-new",
+        f"{user}@{host}",
+    ]
+    if os.environ.get("VM_PASSWORD") and shutil.which("sshpass"):
+        argv = ["sshpass", "-e"] + argv
+    return argv
+
+
+def ssh_run(host: str, user: str, cmd: str, stdin: bytes | None = None,
+            timeout: float = 120) -> tuple[int, bytes]:
+    """Run ``cmd`` on ``host``; return ``(exit_code, stdout)``. stderr passes through."""
+    env = None
+    if os.environ.get("VM_PASSWORD"):
+        env = {**os.environ, "SSHPASS": os.environ["VM_PASSWORD"]}
+    proc = subprocess.run(
+        ssh_command(host, user) + [cmd],
+        input=stdin,
+        stdout=subprocess.PIPE,
+        stdin=None if stdin is not None else subprocess.DEVNULL,
+        env=env,
+        timeout=timeout,
+    )
+    return proc.returncode, proc.stdout
@@ -0,0 +1,50 @@
+"""
+Process-wide pool of authenticated SSH clients, keyed by (host, user).
+
+The TCP + key-exchange + auth handshake is the dominant cost of the short VM
+fix scripts. ``get_ssh`` hands out one ``SSHClient`` per (host, user) for the
+life of the process, reconnecting only if the transport has dropped, and
+closes everything at interpreter exit. Callers should not ``close()`` the
+client themselves. Fix scripts run back to back in one process (``runpy``,
+an operator REPL) share a single authenticated session; ``mindex_ops.VMSession``
+is the usual way in.
+
+Usage (from a script in this directory):
+    from _ssh_pool import get_ssh
+
+    ssh = get_ssh(VM_HOST, VM_USER, VM_PASS)
+"""
+
+from __future__ import annotations
+
+import atexit
+from typing import Any
+
+import paramiko
+
+from _ssh import connect
+
+
+KEEPALIVE_SECONDS = 30
+
+_POOL: dict[tuple[str, str], paramiko.SSHClient] = {}
+
+
+def get_ssh(host: str, user: str, password: str, **connect_kwargs: Any) -> paramiko.SSHClient:
+    """Return the live pooled client for ``(host, user)``, connecting on first use."""
+    key = (host, user)
+    ssh = _POOL.get(key)
+    transport = ssh.get_transport() if ssh is not None else None
+    if transport is None or not transport.is_active():
+        ssh = connect(host, user, password, **connect_kwargs)
+        ssh.get_transport().set_keepalive(KEEPALIVE_SECONDS)
+        _POOL[key] = ssh
+    return ssh
+
+
+@atexit.register
+def close_all() -> None:
+    """Close every pooled client (runs automatically at exit)."""
+    while _POOL:
+        _, ssh = _POOL.popitem()
+        ssh.close()
@@ -0,0 +1,111 @@
+"""
+Run sequential commands over one long-lived interactive SSH shell.
+
+Each ``SSHClient.exec_command`` opens (and tears down) a fresh channel plus
+PTY. The VM maintenance scripts issue 10+ commands back to back, so they
+instead share a single ``invoke_shell`` channel per client and detect the end
+of every command with a unique sentinel echoed after it.
+
+``DockerShell`` goes one step further for scripts that run many commands
+inside a container: it attaches ``docker exec -i <container> bash`` once and
+streams every command into that shell, skipping the per-call ``docker exec``
+startup.
+
+Usage (from a script in this directory):
+    from _ssh_shell import DockerShell, PersistentShell
+
+    code, out = PersistentShell.for_client(ssh).run("docker ps")
+    code, out = DockerShell(ssh, "mindex-postgres").run("psql -U mycosoft -c '\\dx'")
+"""
+
+from __future__ import annotations
+
+import re
+import socket
+import time
+import uuid
+import weakref
+
+import paramiko
+
+
+class PersistentShell:
+    """One interactive shell channel; ``run`` keeps the ``exec_command`` shape."""
+
+    _by_client: "weakref.WeakKeyDictionary[paramiko.SSHClient, PersistentShell]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, ssh: paramiko.SSHClient, timeout: float = 120.0) -> None:
+        self._chan = ssh.invoke_shell(width=250, height=50)
+        self._timeout = timeout
+        # Silence echo/prompts so the buffer only holds command output.
+        # stty needs the PTY on stdin, so this one is sent unwrapped.
+        self._exchange("stty -echo; PS1=''; PS2=''; unset PROMPT_COMMAND", None)
+
+    @classmethod
+    def for_client(cls, ssh: paramiko.SSHClient) -> "PersistentShell":
+        """Return the shell bound to ``ssh``, opening it on first use."""
+        shell = cls._by_client.get(ssh)
+        if shell is None or shell._chan.closed:
+            shell = cls(ssh)
+            cls._by_client[ssh] = shell
+        return shell
+
+    def run(self, cmd: str, timeout: float | None = None) -> tuple[int, bytes]:
+        """Run ``cmd`` and return ``(exit_code, raw_output)``.
+
+        stdin is ``/dev/null``: a command reading it would otherwise swallow
+        the sentinel line and hang. On timeout or EOF the shell is closed, as
+        the command may still be running and would answer the next ``run``.
+        """
+        return self._exchange(f"{{ {cmd}\n}} </dev/null", timeout)
+
+    def _exchange(self, line: str, timeout: float | None) -> tuple[int, bytes]:
+        try:
+            return self._send_and_wait(line, timeout)
+        except (TimeoutError, EOFError):
+            self.close()
+            raise
+
+    def _send_and_wait(self, line: str, timeout: float | None) -> tuple[int, bytes]:
+        token = uuid.uuid4().hex
+        end = re.compile(rb"__END_" + token.encode() + rb"_(\d+)__")
+        self._chan.send(f"{line}\necho __END_{token}_$?__\n")
+
+        deadline = time.monotonic() + (timeout or self._timeout)
+        buf = bytearray()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"Command timed out: {line[:80]}")
+            self._chan.settimeout(remaining)
+            try:
+                chunk = self._chan.recv(32768)
+            except socket.timeout:
+                continue
+            if not chunk:
+                raise EOFError("Remote shell closed")
+            buf += chunk
+            match = end.search(buf)
+            if match:
+                return int(match.group(1)), bytes(buf[: match.start()])
+
+    def close(self) -> None:
+        """Close the channel and stop ``for_client`` from handing it out."""
+        self._chan.close()
+        for ssh, shell in list(self._by_client.items()):
+            if shell is self:
+                del self._by_client[ssh]
+
+
+class DockerShell(PersistentShell):
+    """A ``PersistentShell`` whose commands run inside ``container``."""
+
+    def __init__(self, ssh: paramiko.SSHClient, container: str, timeout: float = 120.0) -> None:
+        super().__init__(ssh, timeout=timeout)
+        self.container = container
+        # No -t: the container shell reads commands from stdin without a prompt,
+        # and the sentinel echo that follows is executed inside the container.
+        # Unwrapped: the container shell must keep the channel as its stdin.
+        self._exchange(f"exec docker exec -i {container} bash", None)
@@ -0,0 +1,94 @@
+"""
+Lane runner shared by the full fungi sync scripts.
+
+Jobs are grouped by upstream API into lanes: ``{source: [job, ...]}`` where a
+job is ``(label, estimate, kind, run)``. Rate limits are per source, so lanes
+run concurrently while the jobs inside a lane run in order and each API still
+sees a single client. ``kind`` ("taxa", "obs" or None) picks the total a
+job's count is added to.
+
+Usage (from a script in this directory):
+    from _sync_lanes import run_full_sync
+
+    run_full_sync(LANES, "MINDEX FULL FUNGI DATA SYNC")
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from mindex_etl.db import STATS_VIEW, prewarm_relations, refresh_stats_view
+from mindex_etl.jobs.backfill_traits import backfill_traits
+
+
+def log(msg: str):
+    """Log with timestamp."""
+    print(f"[{datetime.now().isoformat()}] {msg}", flush=True)
+
+
+# Traits (Mushroom.World + Wikipedia) enrich existing taxa, so they run last.
+TRAITS_JOB = ("taxon traits", "morphological and ecological data", None,
+              lambda: backfill_traits(max_pages=None, enrich_wikipedia=True))
+
+
+def run_job(job) -> tuple:
+    """Run one sync job; returns (kind, count) with count 0 on failure."""
+    label, estimate, kind, run = job
+    log(f"-> Syncing {label} (estimated: {estimate})...")
+    try:
+        count = run()
+        log(f"   ✓ Synced {count:,} {label}")
+        return kind, count
+    except Exception as e:
+        log(f"   ✗ {label} error: {e}")
+        return kind, 0
+
+
+def run_lane(source: str, jobs: list) -> list:
+    """Run one source's jobs in order."""
+    return [run_job(job) for job in jobs]
+
+
+def run_full_sync(lanes: dict, *banner: str) -> dict:
+    """Run every lane, then traits, the stats refresh and prewarm; returns totals."""
+    log("=" * 70)
+    for line in banner:
+        log(line)
+    log("=" * 70)
+
+    totals = {"taxa": 0, "obs": 0}
+
+    with ThreadPoolExecutor(max_workers=len(lanes)) as pool:
+        futures = {pool.submit(run_lane, source, jobs): source for source, jobs in lanes.items()}
+        for future in as_completed(futures):
+            for kind, count in future.result():
+                if kind:
+                    totals[kind] += count
+            log(f"   {futures[future]} lane finished")
+
+    run_job(TRAITS_JOB)
+
+    # Snapshot read by query_data_volume.py; only changes when ETL runs
+    log(f"-> Refreshing dashboard statistics ({STATS_VIEW})...")
+    try:
+        refresh_stats_view()
+        log("   ✓ Statistics refreshed")
+    except Exception as e:
+        log(f"   ✗ Statistics refresh error: {e}")
+
+    # Warm the buffer cache so the first dashboard query after a long sync is not cold
+    log("-> Prewarming hot tables and indexes...")
+    try:
+        for relation, blocks in prewarm_relations().items():
+            log(f"   ✓ {relation}: {blocks:,} blocks")
+    except Exception as e:
+        log(f"   ✗ Prewarm error: {e}")
+
+    # Summary
+    log("\n" + "=" * 70)
+    log("SYNC COMPLETE")
+    log("=" * 70)
+    log(f"Total Taxa: {totals['taxa']:,}")
+    log(f"Total Observations: {totals['obs']:,}")
+    log("=" * 70)
+    return totals
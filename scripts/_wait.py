@@ -0,0 +1,58 @@
+"""
+Readiness polling for the VM maintenance scripts.
+
+Replaces fixed ``time.sleep(N)`` waits after container restarts. The poll
+loop runs on the VM as a single command, so it costs one SSH round-trip and
+returns as soon as the probe passes instead of after a worst-case delay.
+
+Usage (from a script in this directory):
+    from _wait import wait_ready, wait_until
+
+    wait_ready(ssh, "http://localhost:8000/api/mindex/health")
+    wait_until(ssh, "docker exec mindex-postgres pg_isready -q")
+"""
+
+from __future__ import annotations
+
+import time
+
+import paramiko
+
+from _ssh import exec_output
+
+
+API_HEALTH_URL = "http://localhost:8000/api/mindex/health"
+PROBE_MAX_TIME = 2  # seconds per readiness request
+
+
+def wait_until(ssh: paramiko.SSHClient, check: str, timeout: float = 20, interval: float = 0.5) -> bool:
+    """Re-run shell ``check`` on the VM until it exits 0; False after ``timeout``.
+
+    The wait itself is bounded too: if a ``check`` hangs, the channel is
+    dropped a few seconds past ``timeout`` and the result is False.
+    """
+    tries = max(1, int(timeout / interval))
+    loop = (
+        f"for i in $(seq 1 {tries}); do if {check}; then exit 0; fi; "
+        f"sleep {interval}; done; exit 1"
+    )
+    started = time.monotonic()
+    try:
+        code, _ = exec_output(ssh, loop, timeout=timeout + 5)
+        ready = code == 0
+    except TimeoutError:
+        ready = False
+    elapsed = time.monotonic() - started
+    print(f"[WAIT] {'ready' if ready else 'NOT ready'} after {elapsed:.1f}s")
+    return ready
+
+
+def wait_ready(ssh: paramiko.SSHClient, url: str = API_HEALTH_URL, timeout: float = 20,
+               interval: float = 0.5) -> bool:
+    """Poll ``url`` from the VM until it answers HTTP 200."""
+    # Bound each probe, or one stalled request eats the whole poll budget
+    check = (
+        f"[ \"$(curl -s --connect-timeout 1 --max-time {PROBE_MAX_TIME} "
+        f"-o /dev/null -w '%{{http_code}}' {url})\" = 200 ]"
+    )
+    return wait_until(ssh, check, timeout=timeout, interval=interval)
@@ -11,6 +11,7 @@ Environment:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import os
 import shutil
 import subprocess
@@ -22,6 +23,15 @@ from typing import Iterable, List
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 MIGRATIONS_DIR = PROJECT_ROOT / "migrations"
 
+# Bookkeeping table both drivers use to skip unchanged files on reruns.
+LEDGER_DDL = """
+CREATE TABLE IF NOT EXISTS public.schema_migrations (
+    filename text PRIMARY KEY,
+    sha256 bytea NOT NULL,
+    applied_at timestamptz NOT NULL DEFAULT now()
+)
+"""
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Apply MINDEX SQL migrations.")
@@ -41,6 +51,12 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="List the migrations without executing them.",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run every migration even if schema_migrations says it is unchanged "
+        "(both drivers record file hashes there).",
+    )
     return parser.parse_args()
 
 
@@ -50,7 +66,7 @@ def discover_migrations() -> List[Path]:
     return sorted(MIGRATIONS_DIR.glob("*.sql"))
 
 
-def apply_with_psycopg(dsn: str, files: Iterable[Path]) -> None:
+def apply_with_psycopg(dsn: str, files: Iterable[Path], force: bool = False) -> None:
     try:
         import psycopg  # type: ignore
     except ImportError as exc:  # pragma: no cover - graceful fallback
@@ -60,27 +76,77 @@ def apply_with_psycopg(dsn: str, files: Iterable[Path]) -> None:
 
     with psycopg.connect(dsn, autocommit=True) as conn:
         with conn.cursor() as cur:
+            cur.execute(LEDGER_DDL)
+            cur.execute("SELECT filename, sha256 FROM public.schema_migrations")
+            applied = {name: bytes(digest) for name, digest in cur.fetchall()}
+
             for path in files:
-                sql = path.read_text(encoding="utf-8")
+                # psycopg executes bytes as-is; skips the decode/re-encode round-trip.
+                sql = path.read_bytes()
+                digest = hashlib.sha256(sql).digest()
+                if not force and applied.get(path.name) == digest:
+                    print(f"Skipping {path.name} (unchanged)", flush=True)
+                    continue
                 print(f"Applying {path.name} ...", flush=True)
                 cur.execute(sql)
+                cur.execute(
+                    """
+                    INSERT INTO public.schema_migrations (filename, sha256)
+                    VALUES (%s, %s)
+                    ON CONFLICT (filename)
+                    DO UPDATE SET sha256 = EXCLUDED.sha256, applied_at = now()
+                    """,
+                    (path.name, digest),
+                )
 
 
-def apply_with_psql(dsn: str, files: Iterable[Path]) -> None:
+def _sql_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def apply_with_psql(dsn: str, files: Iterable[Path], force: bool = False) -> None:
     if shutil.which("psql") is None:
         raise RuntimeError("psql executable not found in PATH.")
 
+    psql = ["psql", dsn, "-X", "-q", "-v", "ON_ERROR_STOP=1"]
+    subprocess.run(psql + ["-c", LEDGER_DDL], check=True)
+    listing = subprocess.run(
+        psql + ["-At", "-F", "\t", "-c",
+                "SELECT filename, encode(sha256, 'hex') FROM public.schema_migrations"],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    applied = dict(line.split("\t", 1) for line in listing.splitlines() if line)
+
+    pending = []
     for path in files:
-        print(f"Applying {path.name} via psql ...", flush=True)
-        cmd = [
-            "psql",
-            dsn,
-            "-v",
-            "ON_ERROR_STOP=1",
-            "-f",
-            str(path),
-        ]
-        subprocess.run(cmd, check=True)
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        if not force and applied.get(path.name) == digest:
+            print(f"Skipping {path.name} (unchanged)", flush=True)
+            continue
+        pending.append((path, digest))
+    if not pending:
+        return
+
+    # One psql process/connection for the whole batch; files still run in order.
+    # ON_ERROR_STOP ends the batch at the first failing file, so the list below
+    # is what was attempted, not what was applied; hashes are only recorded
+    # once the whole batch has succeeded.
+    cmd = ["psql", dsn, "-v", "ON_ERROR_STOP=1"]
+    for path, _ in pending:
+        cmd += ["-f", str(path)]
+    print(f"Applying {len(pending)} files via psql: {', '.join(p.name for p, _ in pending)}", flush=True)
+    subprocess.run(cmd, check=True)
+
+    values = ", ".join(
+        f"({_sql_literal(path.name)}, decode({_sql_literal(digest)}, 'hex'))"
+        for path, digest in pending
+    )
+    subprocess.run(psql + ["-c", f"""
+        INSERT INTO public.schema_migrations (filename, sha256)
+        VALUES {values}
+        ON CONFLICT (filename)
+        DO UPDATE SET sha256 = EXCLUDED.sha256, applied_at = now()
+    """], check=True)
 
 
 def main() -> None:
@@ -97,13 +163,13 @@ def main() -> None:
     driver = args.driver
     try:
         if driver == "psql":
-            apply_with_psql(args.dsn, files)
+            apply_with_psql(args.dsn, files, force=args.force)
         else:
-            apply_with_psycopg(args.dsn, files)
+            apply_with_psycopg(args.dsn, files, force=args.force)
     except RuntimeError as err:
         if driver == "psycopg":
             print(f"{err}. Falling back to psql...", file=sys.stderr)
-            apply_with_psql(args.dsn, files)
+            apply_with_psql(args.dsn, files, force=args.force)
         else:
             raise
 
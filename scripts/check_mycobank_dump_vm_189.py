@@ -6,8 +6,9 @@ Check where MycoBank dump files are landing on VM 189.
 from __future__ import annotations
 
 import os
+import shlex
 
-import paramiko
+from _ssh import connect
 
 
 VM_IP = "192.168.0.189"
@@ -20,9 +21,7 @@ def main() -> int:
         print("ERROR: VM_PASSWORD not set")
         return 1
 
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect(VM_IP, username=VM_USER, password=vm_password, timeout=30)
+    ssh = connect(VM_IP, VM_USER, vm_password)
 
     paths = [
         "/home/mycosoft/mindex/data/mindex_scrape/mycobank",
@@ -31,15 +30,13 @@ def main() -> int:
         "/home/mycosoft/mindex/C:/Users/admin2/Desktop/MYCOSOFT/DATA/mindex_scrape/mycobank/extracted",
     ]
 
-    for p in paths:
-        cmd = f"echo '--- {p} ---'; ls -lah {p} 2>/dev/null || echo '(missing)'"
-        stdin, stdout, stderr = ssh.exec_command(cmd, timeout=30)
-        print(stdout.read().decode("utf-8", errors="replace"))
-
-    # Also check any in-progress downloads
-    cmd = "ps -ef | grep -E 'mindex_etl|MBList' | grep -v grep || true"
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=30)
-    print("--- processes ---")
+    # One exec for every path listing plus the process probe.
+    quoted = " ".join(shlex.quote(p) for p in paths)
+    cmd = (
+        f"for p in {quoted}; do echo \"--- $p ---\"; ls -lah \"$p\" 2>/dev/null || echo '(missing)'; echo; done; "
+        "echo '--- processes ---'; ps -ef | grep -E 'mindex_etl|MBList' | grep -v grep || true"
+    )
+    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=60)
     print(stdout.read().decode("utf-8", errors="replace"))
 
     ssh.close()
@@ -1,22 +1,24 @@
 #!/usr/bin/env python3
 """Create all missing MINDEX tables"""
 import os
-import paramiko
+import re
 import time
 
+from _ssh import connect
+from _ssh_shell import PersistentShell
+
 VM_HOST = "192.168.0.189"
 VM_USER = "mycosoft"
 VM_PASS = os.environ.get("VM_PASSWORD", "")
 PG_USER = "mycosoft"
 PG_DB = "mindex"
 
+_ANSI_RE = re.compile(rb'\x1b\[[0-9;]*m')
+
 def run(ssh, cmd):
     print(f"$ {cmd}\n")
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=120, get_pty=True)
-    stdout.channel.recv_exit_status()
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    import re
-    out = re.sub(r'\x1b\[[0-9;]*m', '', out)
+    _, raw = PersistentShell.for_client(ssh).run(cmd, timeout=120)
+    out = _ANSI_RE.sub(b'', raw).decode('utf-8', errors='replace').strip()
     print(out + "\n")
     return out
 
@@ -24,10 +26,7 @@ print("="*70)
 print("  Create All Missing MINDEX Tables")
 print("="*70)
 
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-ssh.connect(VM_HOST, username=VM_USER, password=VM_PASS, timeout=30,
-           look_for_keys=False, allow_agent=False)
+ssh = connect(VM_HOST, VM_USER, VM_PASS)
 print("[OK] Connected!\n")
 
 try:
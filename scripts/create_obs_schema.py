@@ -1,37 +1,36 @@
 #!/usr/bin/env python3
 """Create obs schema and tables"""
 import os
-import paramiko
+import re
 import time
 
+from _ssh import connect
+from _ssh_shell import PersistentShell
+
 VM_HOST = "192.168.0.189"
 VM_USER = "mycosoft"
 VM_PASS = os.environ.get("VM_PASSWORD", "")
 PG_USER = "mycosoft"
 PG_DB = "mindex"
 
+_ANSI_RE = re.compile(rb'\x1b\[[0-9;]*m')
+
 def run_cmd(ssh, cmd, desc=""):
     if desc:
         print(f"\n{desc}")
         print('-'*70)
     print(f"$ {cmd}\n")
     
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=120, get_pty=True)
-    stdout.channel.recv_exit_status()
+    _, raw = PersistentShell.for_client(ssh).run(cmd, timeout=120)
     
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    import re
-    out = re.sub(r'\x1b\[[0-9;]*m', '', out)
+    out = _ANSI_RE.sub(b'', raw).decode('utf-8', errors='replace').strip()
     
     if out:
         print(out)
     return out
 
 print("\n[*] Connecting...")
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-ssh.connect(VM_HOST, username=VM_USER, password=VM_PASS, timeout=30,
-           look_for_keys=False, allow_agent=False)
+ssh = connect(VM_HOST, VM_USER, VM_PASS)
 print("[OK] Connected!\n")
 
 try:
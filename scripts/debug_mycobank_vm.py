@@ -9,8 +9,69 @@ and prints a small snippet so we can fix the scraper selectors without guessing.
 from __future__ import annotations
 
 import os
+import shlex
 
-import paramiko
+from _ssh import connect
+
+
+HTML_URL = "https://www.mycobank.org/Basic%20names%20search?Name=agaricus&page=1"
+API_URL = "https://www.mycobank.org/Services/MycoBankNumberService.svc/json/SearchSpecies?Name=a%25&Start=0&Limit=5"
+JS_URL = "https://www.mycobank.org/main.de55b5a77d0f160d.js"
+JS_PATH = "/tmp/mycobank_main.js"
+JS_KEYS = ["SearchSpecies", "MycoBank", "MycoBankNr", "svc", "/api", "Services"]
+
+# Fed to `python3 -` on the VM. The three fetches are independent, so they run
+# concurrently on one client (HTTP/2 multiplexed when the VM has `h2`).
+REMOTE_SCRIPT = f"""
+import asyncio
+import importlib.util
+
+import httpx
+
+html_url = {HTML_URL!r}
+api_url = {API_URL!r}
+js_url = {JS_URL!r}
+headers = {{
+    "User-Agent": "Mozilla/5.0",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Referer": "https://www.mycobank.org/",
+}}
+
+
+async def main():
+    http2 = importlib.util.find_spec("h2") is not None
+    async with httpx.AsyncClient(
+        http2=http2, follow_redirects=True, timeout=60, headers=headers
+    ) as client:
+        return await asyncio.gather(client.get(html_url), client.get(api_url), client.get(js_url))
+
+
+r, r2, r3 = asyncio.run(main())
+print("HTML status:", r.status_code)
+print("HTML len:", len(r.text))
+print("HTML head:", r.text[:500].replace("\\n", " "))
+print("HTML tail:", r.text[-500:].replace("\\n", " "))
+print("API status:", r2.status_code)
+print("API content-type:", r2.headers.get("content-type"))
+print("API head:", r2.text[:800].replace("\\n", " "))
+# The JS bundle is scanned with grep afterwards (see JS_SCAN), not in Python.
+print("JS status:", r3.status_code)
+with open({JS_PATH!r}, "wb") as fh:
+    fh.write(r3.content)
+"""
+
+# Run on the VM after REMOTE_SCRIPT: grep's literal-prefix scan replaces the
+# Python regex sweep over the multi-MB bundle.
+JS_SCAN = f"""
+echo "JS contains counts:"
+for k in {" ".join(shlex.quote(k) for k in JS_KEYS)}; do printf '  %s %s\\n' "$k" "$(grep -c -F -- "$k" {JS_PATH})"; done
+echo "JS api paths count: $(grep -oE '/api/[A-Za-z0-9_/-]+' {JS_PATH} | sort -u | wc -l)"
+echo "JS api paths filtered:"
+grep -oE '/api/[A-Za-z0-9_/-]+' {JS_PATH} | sort -u | grep -iE 'name|tax|myco|fung|species|search' | head -80
+echo "JS SearchSpecies snippet:"
+grep -oE '.{{0,200}}SearchSpecies.{{0,200}}' {JS_PATH} | head -1 || echo N/A
+"""
 
 
 def main() -> int:
@@ -19,43 +80,11 @@ def main() -> int:
         print("ERROR: VM_PASSWORD not set")
         return 1
 
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect("192.168.0.189", username="mycosoft", password=vm_pass, timeout=30)
-
-    html_url = "https://www.mycobank.org/Basic%20names%20search?Name=agaricus&page=1"
-    api_url = "https://www.mycobank.org/Services/MycoBankNumberService.svc/json/SearchSpecies?Name=a%25&Start=0&Limit=5"
-    remote = (
-        "python3 -c \"import httpx; "
-        "headers={'User-Agent':'Mozilla/5.0','Accept':'application/json, text/plain, */*','Accept-Language':'en-US,en;q=0.9','Referer':'https://www.mycobank.org/'}; "
-        f"html_url='{html_url}'; "
-        "r=httpx.get(html_url, follow_redirects=True, timeout=60, headers=headers); "
-        "print('HTML status:', r.status_code); "
-        "print('HTML len:', len(r.text)); "
-        "print('HTML head:', r.text[:500].replace('\\n',' ') ); "
-        "print('HTML tail:', r.text[-500:].replace('\\n',' ') ); "
-        f"api_url='{api_url}'; "
-        "r2=httpx.get(api_url, follow_redirects=True, timeout=60, headers=headers); "
-        "print('API status:', r2.status_code); "
-        "print('API content-type:', r2.headers.get('content-type')); "
-        "print('API head:', r2.text[:800].replace('\\n',' ') ); "
-        # Try to find underlying endpoints by inspecting the JS bundle
-        "js_url='https://www.mycobank.org/main.de55b5a77d0f160d.js'; "
-        "r3=httpx.get(js_url, follow_redirects=True, timeout=60, headers=headers); "
-        "print('JS status:', r3.status_code); "
-        "txt=r3.text; "
-        "keys=['SearchSpecies','MycoBank','MycoBankNr','svc','/api','Services']; "
-        "import re; "
-        "print('JS contains map:', {k:(k in txt) for k in keys}); "
-        "all_api=sorted(set(re.findall(r'/api/[A-Za-z0-9_\\-\\/]+', txt))); "
-        "print('JS api paths count:', len(all_api)); "
-        "hot=[p for p in all_api if any(k in p.lower() for k in ['name','tax','myco','fung','species','search'])][:80]; "
-        "print('JS api paths filtered:', hot); "
-        "idx=txt.find('SearchSpecies'); "
-        "print('JS SearchSpecies snippet:', txt[max(0,idx-200):idx+200] if idx!=-1 else 'N/A');\""
-    )
-
-    stdin, stdout, stderr = ssh.exec_command(remote, timeout=90)
+    ssh = connect("192.168.0.189", "mycosoft", vm_pass)
+
+    stdin, stdout, stderr = ssh.exec_command(f"python3 - && {{ {JS_SCAN} }}", timeout=90)
+    stdin.write(REMOTE_SCRIPT)
+    stdin.channel.shutdown_write()
     out = stdout.read().decode("utf-8", errors="replace")
     err = stderr.read().decode("utf-8", errors="replace")
     print(out)
@@ -10,14 +10,40 @@ Requires:
 
 from __future__ import annotations
 
+import io
 import os
+import shlex
 import time
 
 import paramiko
 
+from _ssh import connect
+
 
 VM_IP = "192.168.0.189"
 VM_USER = "mycosoft"
+MINDEX_DIR = "/home/mycosoft/mindex"
+LOG_MARKER = "__ETL_LOG__"
+
+# Everything before the (fire-and-forget) runner start, executed as one remote script.
+PRE_START_SCRIPT = f"""
+cd {MINDEX_DIR} && git pull origin main 2>&1
+# Ensure XLSX parsing dependency exists (ignore noisy pip output).
+pip3 install --user openpyxl >/tmp/pip_openpyxl.out 2>/tmp/pip_openpyxl.err || true
+python3 -c 'import importlib.util; print("openpyxl_ok="+str(bool(importlib.util.find_spec("openpyxl"))))'
+# Restart runner cleanly.
+for pid in $(pgrep -f mindex_etl.aggressive_runner); do kill -KILL "$pid" || true; done
+sleep 1
+"""
+
+# Post-start probes; the log tail follows LOG_MARKER so it can be filtered locally.
+POST_START_SCRIPT = f"""
+pgrep -af mindex_etl.aggressive_runner || true
+listing=$(ls -lh {MINDEX_DIR}/data/mindex_scrape/mycobank 2>/dev/null || true)
+if [ -n "$listing" ]; then echo "MycoBank dump dir listing:"; echo "$listing"; fi
+echo {LOG_MARKER}
+tail -200 {MINDEX_DIR}/etl.log
+"""
 
 
 def _read_text(stdout: paramiko.ChannelFile) -> str:
@@ -30,9 +56,7 @@ def main() -> int:
         print("ERROR: VM_PASSWORD not set")
         return 1
 
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect(VM_IP, username=VM_USER, password=vm_password, timeout=30)
+    ssh = connect(VM_IP, VM_USER, vm_password)
 
     def run(cmd: str, timeout: int = 120) -> tuple[str, str]:
         stdin, stdout, stderr = ssh.exec_command(cmd, timeout=timeout)
@@ -54,40 +78,32 @@ def main() -> int:
         except Exception:
             pass
 
-    out, err = run("cd /home/mycosoft/mindex && git pull origin main", timeout=180)
-    print(out.strip())
-    if err.strip():
-        print(err.strip())
-
-    # Ensure XLSX parsing dependency exists (ignore noisy pip output).
-    run("pip3 install --user openpyxl >/tmp/pip_openpyxl.out 2>/tmp/pip_openpyxl.err || true", timeout=300)
-
-    out, _ = run(
-        "python3 -c 'import importlib.util; print(\"openpyxl_ok=\"+str(bool(importlib.util.find_spec(\"openpyxl\"))))'",
-        timeout=60,
-    )
-    print(out.strip())
-
-    # Restart runner cleanly.
-    out, _ = run("pgrep -f mindex_etl.aggressive_runner || true", timeout=30)
-    pids = [p.strip() for p in out.split() if p.strip().isdigit()]
-    for pid in pids:
-        run(f"kill -KILL {pid} || true", timeout=10)
-    time.sleep(1)
-
-    run_fire_and_forget("cd /home/mycosoft/mindex && nohup ./start_etl.sh >> etl.log 2>&1 &", timeout=30)
+    def run_script(script: str, timeout: int = 300) -> str:
+        """Upload ``script`` to a fresh ``mktemp`` file, run it, then remove it."""
+        remote_path = run("mktemp /tmp/mindex_etl.XXXXXX", timeout=30)[0].strip()
+        if not remote_path:
+            raise RuntimeError("mktemp failed on the VM")
+        quoted = shlex.quote(remote_path)
+        try:
+            sftp = ssh.open_sftp()
+            try:
+                sftp.putfo(io.BytesIO(script.encode("utf-8")), remote_path)
+            finally:
+                sftp.close()
+            out, err = run(f"bash {quoted}", timeout=timeout)
+        finally:
+            run(f"rm -f {quoted}", timeout=30)
+        return out + err
+
+    print(run_script(PRE_START_SCRIPT, timeout=480).strip())
+
+    run_fire_and_forget(f"cd {MINDEX_DIR} && nohup ./start_etl.sh >> etl.log 2>&1 &", timeout=30)
     time.sleep(2)
 
-    out, _ = run("pgrep -af mindex_etl.aggressive_runner || true", timeout=30)
-    print(out.strip())
-
-    # Show whether the MycoBank dump file is appearing.
-    out, _ = run("ls -lh /home/mycosoft/mindex/data/mindex_scrape/mycobank 2>/dev/null || true", timeout=30)
-    if out.strip():
-        print("MycoBank dump dir listing:")
-        print(out.strip())
+    out = run_script(POST_START_SCRIPT, timeout=60)
+    probes, _, out = out.partition(LOG_MARKER)
+    print(probes.strip())
 
-    out, _ = run("tail -200 /home/mycosoft/mindex/etl.log", timeout=30)
     # Only print lines relevant to the restart + MycoBank
     for ln in out.splitlines():
         low = ln.lower()
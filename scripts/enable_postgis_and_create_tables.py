@@ -1,27 +1,30 @@
 #!/usr/bin/env python3
 """Enable PostGIS and create all MINDEX tables"""
 import os
-import paramiko
+import re
 import time
 
+from _api import curl_json
+from _ssh import connect
+from _ssh_shell import PersistentShell
+
 VM_HOST = "192.168.0.189"
 VM_USER = "mycosoft"
 VM_PASS = os.environ.get("VM_PASSWORD", "")
 PG_USER = "mycosoft"
 PG_DB = "mindex"
 
+_ANSI_RE = re.compile(rb'\x1b\[[0-9;]*m')
+
 def run_cmd(ssh, cmd, desc=""):
     if desc:
         print(f"\n{desc}")
         print('-'*70)
     print(f"$ {cmd}\n")
     
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=120, get_pty=True)
-    stdout.channel.recv_exit_status()
+    _, raw = PersistentShell.for_client(ssh).run(cmd, timeout=120)
     
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    import re
-    out = re.sub(r'\x1b\[[0-9;]*m', '', out)
+    out = _ANSI_RE.sub(b'', raw).decode('utf-8', errors='replace').strip()
     
     print(out)
     return out
@@ -30,35 +33,21 @@ print("="*70)
 print("  MINDEX Complete Schema Fix")
 print("="*70)
 
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-ssh.connect(VM_HOST, username=VM_USER, password=VM_PASS, timeout=30,
-           look_for_keys=False, allow_agent=False)
+ssh = connect(VM_HOST, VM_USER, VM_PASS)
 print("[OK] Connected!\n")
 
 try:
-    # Enable PostGIS extension
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE EXTENSION IF NOT EXISTS postgis;'", 
-            "Step 1: Enable PostGIS")
-    
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE EXTENSION IF NOT EXISTS \"uuid-ossp\";'", 
-            "Step 2: Enable uuid-ossp")
-    
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE EXTENSION IF NOT EXISTS pgcrypto;'", 
-            "Step 3: Enable pgcrypto")
-    
-    # Create schemas
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE SCHEMA IF NOT EXISTS obs;'", 
-            "Step 4: Create obs Schema")
-    
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE SCHEMA IF NOT EXISTS bio;'", 
-            "Step 5: Create bio Schema")
-    
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE SCHEMA IF NOT EXISTS telemetry;'", 
-            "Step 6: Create telemetry Schema")
-    
-    # Now create observation table with PostGIS
-    sql = """CREATE TABLE IF NOT EXISTS obs.observation (
+    # Extensions, schemas and obs.observation in one psql session and one
+    # transaction: a single commit instead of one per statement.
+    ddl = """CREATE EXTENSION IF NOT EXISTS postgis;
+    CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+    CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
+    CREATE SCHEMA IF NOT EXISTS obs;
+    CREATE SCHEMA IF NOT EXISTS bio;
+    CREATE SCHEMA IF NOT EXISTS telemetry;
+
+    CREATE TABLE IF NOT EXISTS obs.observation (
         id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
         taxon_id uuid REFERENCES core.taxon (id) ON DELETE SET NULL,
         source text NOT NULL,
@@ -77,8 +66,8 @@ try:
     CREATE INDEX IF NOT EXISTS idx_observation_observed_at ON obs.observation (observed_at);
     CREATE INDEX IF NOT EXISTS idx_observation_location ON obs.observation USING GIST (location);"""
     
-    run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c \"{sql}\"", 
-            "Step 7: Create obs.observation Table")
+    run_cmd(ssh, f"docker exec -i mindex-postgres psql -U {PG_USER} -d {PG_DB} --single-transaction -v ON_ERROR_STOP=1 -f - <<'EOSQL'\n{ddl}\nEOSQL", 
+            "Step 1-7: Enable Extensions, Create Schemas and obs.observation")
     
     # Verify table created
     run_cmd(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c '\\dt obs.*'", 
@@ -99,12 +88,14 @@ try:
     time.sleep(10)
     
     # Test stats endpoint
-    run_cmd(ssh, "curl -s http://localhost:8000/api/mindex/stats | python3 -m json.tool 2>&1 | head -50", 
-            "Step 11: Test Stats Endpoint")
+    print("\nStep 11: Test Stats Endpoint")
+    print('-'*70)
+    curl_json(ssh, "http://localhost:8000/api/mindex/stats", max_lines=50)
     
     # Test observations endpoint
-    run_cmd(ssh, 'curl -s "http://localhost:8000/api/mindex/observations?limit=3" | python3 -m json.tool 2>&1 | head -100', 
-            "Step 12: Test Observations Endpoint")
+    print("\nStep 12: Test Observations Endpoint")
+    print('-'*70)
+    curl_json(ssh, "http://localhost:8000/api/mindex/observations?limit=3", max_lines=100)
     
 except Exception as e:
     print(f"\n[ERROR] {e}")
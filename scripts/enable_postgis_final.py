@@ -1,145 +1,123 @@
 #!/usr/bin/env python3
-"""Enable PostGIS extension in MINDEX database"""
-import os
-import paramiko
-import time
+"""Enable PostGIS extension in MINDEX database
 
-VM_HOST = "192.168.0.189"
-VM_USER = "mycosoft"
-VM_PASS = os.environ.get("VM_PASSWORD", "")
-PG_USER = "mycosoft"
-PG_DB = "mindex"
+Requires:
+  - env var VM_PASSWORD (ssh password for the VM)
+  - env var PG_PASSWORD (MINDEX database password) for steps 5-7, which
+    connect with psycopg through an SSH tunnel rather than ``docker exec``
+"""
+from _pg_tunnel import pg_connect
+from mindex_ops import PG_DB, PG_USER, VMSession
 
-def run(ssh, cmd):
-    print(f"$ {cmd}\n")
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=120, get_pty=True)
-    stdout.channel.recv_exit_status()
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    import re
-    out = re.sub(r'\x1b\[[0-9;]*m', '', out)
-    print(out + "\n")
-    return out
+# Steps 2-4 need psql meta-commands (\dx, \c), so they run as one uploaded
+# psql -f script; \echo markers keep the output step-labelled.
+EXT_SQL = rf"""\echo ===STEP_2 List Current Extensions===
+\dx
+\echo ===STEP_3 Enable PostGIS Extension===
+CREATE EXTENSION IF NOT EXISTS postgis;
+\c postgres
+CREATE EXTENSION IF NOT EXISTS postgis;
+\c {PG_DB}
+CREATE EXTENSION IF NOT EXISTS postgis CASCADE;
+\echo ===STEP_4 Verify PostGIS Enabled===
+SELECT PostGIS_version();
+"""
 
-print("\n[*] Connecting...")
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-ssh.connect(VM_HOST, username=VM_USER, password=VM_PASS, timeout=30,
-           look_for_keys=False, allow_agent=False)
-print("[OK]\n")
+OBS_SQL = """
+CREATE SCHEMA IF NOT EXISTS obs;
+CREATE TABLE IF NOT EXISTS obs.observation (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    taxon_id uuid REFERENCES core.taxon (id) ON DELETE SET NULL,
+    source text NOT NULL,
+    source_id text,
+    observer text,
+    observed_at timestamptz NOT NULL,
+    location geography(Point, 4326),
+    accuracy_m double precision,
+    media jsonb NOT NULL DEFAULT '[]'::jsonb,
+    notes text,
+    metadata jsonb NOT NULL DEFAULT '{}'::jsonb,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_observation_taxon ON obs.observation (taxon_id);
+CREATE INDEX IF NOT EXISTS idx_observation_source ON obs.observation (source);
+CREATE INDEX IF NOT EXISTS idx_observation_observed_at ON obs.observation (observed_at);
+CREATE INDEX IF NOT EXISTS idx_observation_location ON obs.observation USING GIST (location);
+"""
 
-try:
-    print("="*70)
-    print("Step 1: Check PostGIS Package")
-    print("="*70)
-    run(ssh, "docker exec mindex-postgres dpkg -l | grep postgis || echo 'PostGIS not installed'")
-    
-    print("="*70)
-    print("Step 2: List Current Extensions")
-    print("="*70)
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c '\\dx'")
-    
-    print("="*70)
-    print("Step 3: Enable PostGIS Extension")
-    print("="*70)
-    # Try as mycosoft user first
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE EXTENSION IF NOT EXISTS postgis;'")
-    
-    # Also try as superuser in postgres database
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d postgres -c 'CREATE EXTENSION IF NOT EXISTS postgis;' 2>&1 || echo 'Tried postgres db'")
-    
-    # Try in mindex database again
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'CREATE EXTENSION IF NOT EXISTS postgis CASCADE;' 2>&1")
-    
-    print("="*70)
-    print("Step 4: Verify PostGIS Enabled")
-    print("="*70)
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c 'SELECT PostGIS_version();' 2>&1")
-    
-    print("="*70)
-    print("Step 5: Create obs Schema and Table")
-    print("="*70)
-    sql = """
-    CREATE SCHEMA IF NOT EXISTS obs;
-    CREATE TABLE IF NOT EXISTS obs.observation (
-        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-        taxon_id uuid REFERENCES core.taxon (id) ON DELETE SET NULL,
-        source text NOT NULL,
-        source_id text,
-        observer text,
-        observed_at timestamptz NOT NULL,
-        location geography(Point, 4326),
-        accuracy_m double precision,
-        media jsonb NOT NULL DEFAULT '[]'::jsonb,
-        notes text,
-        metadata jsonb NOT NULL DEFAULT '{}'::jsonb,
-        created_at timestamptz NOT NULL DEFAULT now()
-    );
-    CREATE INDEX IF NOT EXISTS idx_observation_taxon ON obs.observation (taxon_id);
-    CREATE INDEX IF NOT EXISTS idx_observation_source ON obs.observation (source);
-    CREATE INDEX IF NOT EXISTS idx_observation_observed_at ON obs.observation (observed_at);
-    CREATE INDEX IF NOT EXISTS idx_observation_location ON obs.observation USING GIST (location);
-    """
-    
-    run(ssh, f"echo \"{sql}\" | docker exec -i mindex-postgres psql -U {PG_USER} -d {PG_DB}")
-    
-    print("="*70)
-    print("Step 6: Verify Table Created")
-    print("="*70)
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c '\\dt obs.*'")
-    
-    print("="*70)
-    print("Step 7: Create bio Schema Tables")
-    print("="*70)
-    bio_sql = """
-    CREATE SCHEMA IF NOT EXISTS bio;
-    CREATE TABLE IF NOT EXISTS bio.taxon_trait (
-        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-        taxon_id uuid NOT NULL REFERENCES core.taxon (id) ON DELETE CASCADE,
-        trait_name text NOT NULL,
-        value_text text,
-        value_numeric double precision,
-        value_unit text,
-        source text,
-        metadata jsonb NOT NULL DEFAULT '{}'::jsonb,
-        created_at timestamptz NOT NULL DEFAULT now(),
-        updated_at timestamptz NOT NULL DEFAULT now()
-    );
-    CREATE TABLE IF NOT EXISTS bio.genome (
-        id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
-        taxon_id uuid NOT NULL REFERENCES core.taxon (id) ON DELETE CASCADE,
-        source text NOT NULL,
-        accession text NOT NULL,
-        assembly_level text,
-        release_date date,
-        metadata jsonb NOT NULL DEFAULT '{}'::jsonb,
-        created_at timestamptz NOT NULL DEFAULT now()
-    );
-    """
-    run(ssh, f"echo \"{bio_sql}\" | docker exec -i mindex-postgres psql -U {PG_USER} -d {PG_DB}")
-    
-    print("="*70)
-    print("Step 8: Restart API")
-    print("="*70)
-    run(ssh, "docker restart mindex-api")
-    print("\n[WAIT] 10 seconds...")
-    time.sleep(10)
-    
-    print("="*70)
-    print("Step 9: Test Stats Endpoint")
-    print("="*70)
-    run(ssh, "curl -s http://localhost:8000/api/mindex/stats | python3 -m json.tool")
-    
-    print("="*70)
-    print("Step 10: Test Observations Endpoint")
-    print("="*70)
-    run(ssh, 'curl -s "http://localhost:8000/api/mindex/observations?limit=3" | python3 -m json.tool')
-    
-except Exception as e:
-    print(f"\n[ERROR] {e}")
-    import traceback
-    traceback.print_exc()
-finally:
-    ssh.close()
+BIO_SQL = """
+CREATE SCHEMA IF NOT EXISTS bio;
+CREATE TABLE IF NOT EXISTS bio.taxon_trait (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    taxon_id uuid NOT NULL REFERENCES core.taxon (id) ON DELETE CASCADE,
+    trait_name text NOT NULL,
+    value_text text,
+    value_numeric double precision,
+    value_unit text,
+    source text,
+    metadata jsonb NOT NULL DEFAULT '{}'::jsonb,
+    created_at timestamptz NOT NULL DEFAULT now(),
+    updated_at timestamptz NOT NULL DEFAULT now()
+);
+CREATE TABLE IF NOT EXISTS bio.genome (
+    id uuid PRIMARY KEY DEFAULT gen_random_uuid(),
+    taxon_id uuid NOT NULL REFERENCES core.taxon (id) ON DELETE CASCADE,
+    source text NOT NULL,
+    accession text NOT NULL,
+    assembly_level text,
+    release_date date,
+    metadata jsonb NOT NULL DEFAULT '{}'::jsonb,
+    created_at timestamptz NOT NULL DEFAULT now()
+);
+"""
+
+# One catalog probe for everything steps 1-7 would create.
+PROBE_SQL = (
+    "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'postgis'), "
+    "to_regclass('obs.observation') IS NOT NULL "
+    "AND to_regclass('bio.taxon_trait') IS NOT NULL "
+    "AND to_regclass('bio.genome') IS NOT NULL"
+)
+
+with VMSession() as vm:
+    try:
+        has_postgis, has_tables = (v == "t" for v in vm.query(PROBE_SQL)[0])
+        
+        if has_postgis:
+            print("[SKIP] Steps 1-4: PostGIS already enabled")
+        else:
+            vm.run("dpkg -l | grep postgis || echo 'PostGIS not installed'",
+                   "Step 1: Check PostGIS Package", container="mindex-postgres")
+            vm.run_sql(EXT_SQL, "Steps 2-4: Extensions")
+        
+        if has_tables:
+            print("[SKIP] Steps 5-7: obs and bio tables already exist")
+        else:
+            # Steps 5-7: plain DDL over a psycopg connection tunnelled through the
+            # SSH transport, committed as one transaction.
+            print("="*70)
+            print("Steps 5-7: Create obs and bio Schemas")
+            print("="*70)
+            with pg_connect(vm.ssh, PG_USER, PG_DB) as conn:
+                with conn.transaction():
+                    conn.execute(OBS_SQL)
+                    conn.execute(BIO_SQL)
+                tables = conn.execute(
+                    "SELECT schemaname || '.' || tablename FROM pg_tables "
+                    "WHERE schemaname IN ('obs', 'bio') ORDER BY 1"
+                ).fetchall()
+            print("Tables: " + ", ".join(t for (t,) in tables) + "\n")
+        
+        vm.run("docker restart mindex-api", "Step 8: Restart API")
+        vm.wait_ready()
+        
+        vm.get_json("/api/mindex/stats", "Step 9: Test Stats Endpoint")
+        vm.get_json("/api/mindex/observations?limit=3", "Step 10: Test Observations Endpoint")
+        
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
+        import traceback
+        traceback.print_exc()
 
 print("\n" + "="*70)
 print("  [SUCCESS] All schemas created!")
@@ -5,14 +5,12 @@ Restarts PostgreSQL and MINDEX API containers on VM 192.168.0.189
 """
 
 import os
-import paramiko
 import sys
-import time
+from concurrent.futures import ThreadPoolExecutor
+
+from mindex_ops import VM_HOST, VMSession
 
-VM_HOST = "192.168.0.189"
-VM_USER = "mycosoft"
 VM_PASS = os.environ.get("VM_PASSWORD")
-MINDEX_DIR = "/home/mycosoft/mindex"
 
 if not VM_PASS:
     print("ERROR: VM_PASSWORD environment variable not set")
@@ -20,118 +18,79 @@ if not VM_PASS:
     print("Or check your VM password file")
     sys.exit(1)
 
-def run_cmd(ssh, cmd, desc=""):
-    """Execute command and print output"""
-    if desc:
-        print(f"\n{'='*60}")
-        print(f"  {desc}")
-        print('='*60)
-    print(f"$ {cmd}\n")
-    
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=60)
-    exit_code = stdout.channel.recv_exit_status()
-    
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    err = stderr.read().decode('utf-8', errors='replace').strip()
-    
-    if out:
-        print(out)
-    if err:
-        print(f"STDERR: {err}")
-    
-    return exit_code, out, err
+# Readiness probe per restarted container, run on the VM.
+READY_PROBES = {
+    "mindex-postgres": "docker exec mindex-postgres pg_isready -q",
+    "mindex-redis": "docker exec mindex-redis redis-cli ping | grep -q PONG",
+    "mindex-qdrant": "curl -sf -o /dev/null http://localhost:6333/readyz",
+}
+
+def wait_for_healthy(vm, timeout=15):
+    """Poll every READY_PROBES entry in one remote loop; True once all pass."""
+    checks = " && ".join(f"({probe})" for probe in READY_PROBES.values())
+    return vm.wait_until(checks, timeout=timeout)
 
 def main():
     print("="*60)
     print("  MINDEX Database Fix Script")
     print(f"  Target: {VM_HOST}")
     print("="*60)
-    
-    # Connect
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    
-    print(f"\n[*] Connecting to {VM_USER}@{VM_HOST}...")
+
+    # Try SSH key first, then password
+    vm = VMSession(
+        password=VM_PASS,
+        key_filename=os.path.expanduser("~/.ssh/id_rsa"),
+        look_for_keys=True,
+        allow_agent=True,
+    )
     try:
-        # Try SSH key first, then password
-        ssh.connect(
-            VM_HOST, 
-            username=VM_USER, 
-            password=VM_PASS, 
-            key_filename=os.path.expanduser("~/.ssh/id_rsa"),
-            look_for_keys=True,
-            allow_agent=True,
-            timeout=30
-        )
-        print("[OK] SSH connection established!\n")
+        vm.connect()
     except Exception as e:
         print(f"[ERROR] SSH connection failed: {e}")
-        print(f"[INFO] Tried password auth and SSH key ~/.ssh/id_rsa")
-        print(f"[FIX] Ensure VM password is correct or SSH key is configured")
+        print("[INFO] Tried password auth and SSH key ~/.ssh/id_rsa")
+        print("[FIX] Ensure VM password is correct or SSH key is configured")
         sys.exit(1)
-    
-    # Check current status
-    run_cmd(ssh, "docker ps --filter name=mindex --format '{{.Names}}: {{.Status}}'", 
-            "Step 1: Current Container Status")
-    
-    # Check what's on port 8000
-    run_cmd(ssh, "curl -s http://localhost:8000/api/mindex/health 2>&1 | python3 -m json.tool || curl -s http://localhost:8000/api/mindex/health", 
-            "Step 2: Current API Health")
-    
-    # Check PostgreSQL specifically
-    run_cmd(ssh, "docker logs mindex-postgres --tail 10 2>&1 || docker logs mindex-mindex-postgres-1 --tail 10 2>&1", 
-            "Step 3: PostgreSQL Logs")
-    
-    # Restart PostgreSQL
-    print("\n" + "="*60)
-    print("  Step 4: Restarting PostgreSQL...")
-    print("="*60)
-    run_cmd(ssh, f"cd {MINDEX_DIR} && docker compose restart mindex-postgres")
-    print("[WAIT] Waiting 8 seconds for PostgreSQL startup...")
-    time.sleep(8)
-    
-    # Restart Redis
-    run_cmd(ssh, f"cd {MINDEX_DIR} && docker compose restart mindex-redis", 
-            "Step 5: Restarting Redis")
-    time.sleep(3)
-    
-    # Restart Qdrant
-    run_cmd(ssh, f"cd {MINDEX_DIR} && docker compose restart mindex-qdrant", 
-            "Step 6: Restarting Qdrant")
-    time.sleep(3)
-    
-    # Restart MINDEX API
-    run_cmd(ssh, f"cd {MINDEX_DIR} && docker compose restart mindex-api", 
-            "Step 7: Restarting MINDEX API")
-    print("[WAIT] Waiting 10 seconds for API startup...")
-    time.sleep(10)
-    
-    # Check final status
-    run_cmd(ssh, "docker ps --filter name=mindex --format '{{.Names}}: {{.Status}}'", 
-            "Step 8: Final Container Status")
-    
-    # Check health
-    exit_code, out, err = run_cmd(ssh, 
-            "curl -s http://localhost:8000/api/mindex/health 2>&1", 
-            "Step 9: API Health Check")
-    
-    if "ok" in out and '"db":' in out:
-        if '"db": "ok"' in out or '"db":"ok"' in out:
-            print("\n[SUCCESS] Database connection RESTORED!")
-        else:
-            print("\n[WARNING] API is up but database still showing error")
-    
-    # Test observations endpoint
-    exit_code, out, err = run_cmd(ssh, 
-            'curl -s "http://localhost:8000/api/mindex/observations?limit=3" 2>&1 | head -50', 
-            "Step 10: Test Observations Endpoint")
-    
-    # Check API logs for errors
-    run_cmd(ssh, "docker logs mindex-api --tail 20 2>&1 || docker logs mindex-mindex-api-1 --tail 20 2>&1", 
-            "Step 11: Recent API Logs")
-    
-    ssh.close()
-    
+
+    with vm:
+        print("\nStep 1: Current Container Status")
+        vm.status()
+
+        vm.get_json("/api/mindex/health", "Step 2: Current API Health")
+
+        # Check PostgreSQL specifically
+        vm.run("docker logs mindex-postgres --tail 10 2>&1 || docker logs mindex-mindex-postgres-1 --tail 10 2>&1",
+               "Step 3: PostgreSQL Logs")
+
+        # Restart PostgreSQL, Redis and Qdrant together; none depends on the others' restart order.
+        print("\n" + "="*60)
+        print("  Steps 4-6: Restarting PostgreSQL, Redis, Qdrant...")
+        print("="*60)
+        with ThreadPoolExecutor(max_workers=len(READY_PROBES)) as pool:
+            list(pool.map(vm.restart, READY_PROBES))
+        print("[WAIT] Polling until all three report ready (max 15s)...")
+        wait_for_healthy(vm)
+
+        vm.restart("mindex-api", desc="Step 7: Restarting MINDEX API")
+        vm.wait_ready()
+
+        print("\nStep 8: Final Container Status")
+        vm.status(refresh=True)
+
+        out = vm.get_json("/api/mindex/health", "Step 9: API Health Check")
+
+        if "ok" in out and '"db":' in out:
+            if '"db": "ok"' in out or '"db":"ok"' in out:
+                print("\n[SUCCESS] Database connection RESTORED!")
+            else:
+                print("\n[WARNING] API is up but database still showing error")
+
+        vm.get_json("/api/mindex/observations?limit=3", "Step 10: Test Observations Endpoint",
+                    max_lines=50)
+
+        # Check API logs for errors
+        vm.run("docker logs mindex-api --tail 20 2>&1 || docker logs mindex-mindex-api-1 --tail 20 2>&1",
+               "Step 11: Recent API Logs")
+
     print("\n" + "="*60)
     print("  [DONE] RESTART COMPLETE")
     print("="*60)
@@ -142,6 +101,6 @@ def main():
     print("     http://localhost:3010/natureos/mindex")
     print("     http://localhost:3010/natureos/mindex/explorer")
     print("\n  3. Check if data pipeline shows 'online'")
-    
+
 if __name__ == "__main__":
     main()
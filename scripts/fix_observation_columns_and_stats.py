@@ -1,134 +1,80 @@
 #!/usr/bin/env python3
 """Fix obs.observation table structure and update stats router"""
-import os
-import paramiko
-import time
+from mindex_ops import MINDEX_DIR, PG_DB, PG_USER, VMSession
 
-VM_HOST = "192.168.0.189"
-VM_USER = "mycosoft"
-VM_PASS = os.environ.get("VM_PASSWORD", "")
-PG_USER = "mycosoft"
-PG_DB = "mindex"
-MINDEX_DIR = "/home/mycosoft/mindex"
+def edit_remote(sftp, path, transform):
+    """Read ``path`` over SFTP, apply ``transform`` locally, write back if changed."""
+    with sftp.open(path, "r") as f:
+        src = f.read().decode("utf-8")
+    fixed = transform(src)
+    if fixed != src:
+        with sftp.open(path, "w") as f:
+            f.write(fixed.encode("utf-8"))
 
-def run(ssh, cmd):
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=180, get_pty=True)
-    stdout.channel.recv_exit_status()
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    import re
-    out = re.sub(r'\x1b\[[0-9;]*m', '', out)
-    print(out + "\n")
-    return out
+def fix_stats(src):
+    """Use latitude/longitude instead of location; count non-empty media arrays."""
+    src = src.replace(
+        'FROM obs.observation WHERE location IS NOT NULL',
+        'FROM obs.observation WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
+    )
+    return src.replace(
+        "WHERE media IS NOT NULL AND media::text != '[]'",
+        "WHERE media IS NOT NULL AND jsonb_array_length(media) > 0"
+    )
 
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-ssh.connect(VM_HOST, username=VM_USER, password=VM_PASS, timeout=30,
-           look_for_keys=False, allow_agent=False)
+def fix_observations(src):
+    """Comment out the location_geojson select and its post-processing."""
+    new_lines = []
+    for line in src.splitlines(keepends=True):
+        stripped = line.lstrip()
+        if stripped.startswith(("-- ", "# ")):
+            new_lines.append(line)
+        elif 'loc = data.pop("location_geojson"' in line:
+            new_lines.append('        # ' + line)
+        elif 'ST_AsGeoJSON' in line or 'location_geojson' in line:
+            new_lines.append('            -- ' + line)
+        elif 'data["location"] = json.loads(loc)' in line:
+            new_lines.append('        # ' + line)
+        else:
+            new_lines.append(line)
+    return "".join(new_lines)
 
-try:
-    print("="*70)
-    print("[1] Check current obs.observation structure")
-    print("="*70)
-    run(ssh, f"docker exec mindex-postgres psql -U {PG_USER} -d {PG_DB} -c '\\d obs.observation'")
-    
-    print("="*70)
-    print("[2] Fix stats.py to use latitude/longitude instead of location")
-    print("="*70)
-    
-    # Update stats.py file on VM
-    stats_fix = """cd /home/mycosoft/mindex && cat > /tmp/fix_stats.py << 'EEOF'
-# Fix stats query to use lat/lng instead of location
-import re
-
-with open('mindex_api/routers/stats.py', 'r') as f:
-    content = f.read()
-
-# Replace location IS NOT NULL with latitude IS NOT NULL AND longitude IS NOT NULL
-content = content.replace(
-    'FROM obs.observation WHERE location IS NOT NULL',
-    'FROM obs.observation WHERE latitude IS NOT NULL AND longitude IS NOT NULL'
-)
-
-# Replace media check
-content = content.replace(
-    "WHERE media IS NOT NULL AND media::text != '[]'",
-    "WHERE media IS NOT NULL AND jsonb_array_length(media) > 0"
-)
-
-with open('mindex_api/routers/stats.py', 'w') as f:
-    f.write(content)
-
-print("Stats router fixed!")
-EEOF
-python3 /tmp/fix_stats.py"""
-    
-    out = run(ssh, stats_fix)
-    
-    print("="*70)
-    print("[3] Fix observations.py to use latitude/longitude")
-    print("="*70)
-    
-    obs_fix = """cd /home/mycosoft/mindex && cat > /tmp/fix_obs.py << 'EEOF'
-# Simplify observations query
-with open('mindex_api/routers/observations.py', 'r') as f:
-    lines = f.readlines()
-
-# Find and comment out location_geojson line
-new_lines = []
-for line in lines:
-    if 'ST_AsGeoJSON' in line or 'location_geojson' in line:
-        new_lines.append('            -- ' + line)
-    elif 'loc = data.pop("location_geojson"' in line:
-        new_lines.append('        # ' + line)
-    elif 'data["location"] = json.loads(loc)' in line:
-        new_lines.append('        # ' + line)
-    else:
-        new_lines.append(line)
-
-with open('mindex_api/routers/observations.py', 'w') as f:
-    f.writelines(new_lines)
-
-print("Observations router fixed!")
-EEOF
-python3 /tmp/fix_obs.py"""
-    
-    out = run(ssh, obs_fix)
-    
-    print("="*70)
-    print("[4] Restart API with fixed code")
-    print("="*70)
-    run(ssh, "docker restart mindex-api")
-    print("\n[WAIT] 15 seconds...")
-    time.sleep(15)
-    
-    print("="*70)
-    print("[5] Test Health")
-    print("="*70)
-    run(ssh, "curl -s http://localhost:8000/api/mindex/health")
-    
-    print("="*70)
-    print("[6] Test Stats (Should Work Now!)")
-    print("="*70)
-    out = run(ssh, "curl -s http://localhost:8000/api/mindex/stats")
-    
-    if "{" in out and "total_taxa" in out:
-        print("[SUCCESS] Stats endpoint WORKING!")
-    else:
-        print(f"[ERROR] Stats failed: {out[:500]}")
-        run(ssh, "docker logs mindex-api --tail 20")
-    
-    print("="*70)
-    print("[7] Test Observations")
-    print("="*70)
-    out = run(ssh, 'curl -s "http://localhost:8000/api/mindex/observations?limit=3"')
-    
-    if "{" in out and ("data" in out or "observations" in out):
-        print("[SUCCESS] Observations endpoint WORKING!")
-    
-except Exception as e:
-    print(f"\n[ERROR] {e}")
-finally:
-    ssh.close()
+with VMSession() as vm:
+    try:
+        vm.run(f"psql -U {PG_USER} -d {PG_DB} -c '\\d obs.observation'",
+               "[1] Check current obs.observation structure", container="mindex-postgres")
+        
+        with vm.ssh.open_sftp() as sftp:
+            print("="*70)
+            print("[2] Fix stats.py to use latitude/longitude instead of location")
+            print("="*70)
+            edit_remote(sftp, f"{MINDEX_DIR}/mindex_api/routers/stats.py", fix_stats)
+            print("Stats router fixed!\n")
+            
+            print("="*70)
+            print("[3] Fix observations.py to use latitude/longitude")
+            print("="*70)
+            edit_remote(sftp, f"{MINDEX_DIR}/mindex_api/routers/observations.py", fix_observations)
+            print("Observations router fixed!\n")
+        
+        vm.run("docker restart mindex-api", "[4] Restart API with fixed code")
+        vm.wait_ready(timeout=30)
+        
+        vm.get_json("/api/mindex/health", "[5] Test Health")
+        
+        out = vm.get_json("/api/mindex/stats", "[6] Test Stats (Should Work Now!)")
+        if "{" in out and "total_taxa" in out:
+            print("[SUCCESS] Stats endpoint WORKING!")
+        else:
+            print(f"[ERROR] Stats failed: {out[:500]}")
+            vm.run("docker logs mindex-api --tail 20")
+        
+        out = vm.get_json("/api/mindex/observations?limit=3", "[7] Test Observations")
+        if "{" in out and ("data" in out or "observations" in out):
+            print("[SUCCESS] Observations endpoint WORKING!")
+        
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
 
 print("\n[DONE] MINDEX API Fixed!")
 print("\nTest from Windows:")
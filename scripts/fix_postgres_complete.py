@@ -1,117 +1,67 @@
 #!/usr/bin/env python3
 """Complete PostgreSQL fix for MINDEX"""
-import os
-import paramiko
-import sys
-import time
-
-VM_HOST = "192.168.0.189"
-VM_USER = "mycosoft"
-VM_PASS = os.environ.get("VM_PASSWORD", "")
-MINDEX_DIR = "/home/mycosoft/mindex"
-
-def run_cmd(ssh, cmd, desc="", timeout=120):
-    if desc:
-        print(f"\n{'='*70}")
-        print(f"  {desc}")
-        print('='*70)
-    print(f"$ {cmd}\n")
-    
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=timeout, get_pty=True)
-    exit_code = stdout.channel.recv_exit_status()
-    
-    out = stdout.read().decode('utf-8', errors='replace').strip()
-    
-    if out:
-        print(out)
-    
-    return exit_code, out
+from mindex_ops import MINDEX_DIR, VMSession
 
 print("="*70)
 print("  MINDEX Complete Database Fix")
 print("="*70)
 
-ssh = paramiko.SSHClient()
-ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-print(f"\n[*] Connecting to {VM_USER}@{VM_HOST}...")
-ssh.connect(VM_HOST, username=VM_USER, password=VM_PASS, timeout=30,
-           look_for_keys=False, allow_agent=False)
-print("[OK] Connected!\n")
-
-try:
-    # Check docker-compose version
-    code, out = run_cmd(ssh, "docker-compose --version 2>&1 || docker compose version 2>&1", 
-            "Step 1: Docker Compose Version")
-    
-    # Use correct docker-compose command
-    if "docker-compose" in out.lower() and "version" in out.lower():
-        DC = "docker-compose"
-    else:
-        DC = "docker compose"
-    print(f"[INFO] Using command: {DC}\n")
-    
-    # Check containers
-    run_cmd(ssh, f"cd {MINDEX_DIR} && {DC} ps", 
-            "Step 2: Container Status")
-    
-    # Check PostgreSQL env vars
-    run_cmd(ssh, f"cd {MINDEX_DIR} && cat .env | grep -E 'POSTGRES|DB' || echo 'No .env file'", 
-            "Step 3: Database Configuration")
-    
-    # Stop and remove postgres to rebuild
-    print("\n[ACTION] Rebuilding PostgreSQL container...")
-    run_cmd(ssh, f"cd {MINDEX_DIR} && {DC} stop mindex-postgres", "Step 4a: Stop PostgreSQL")
-    run_cmd(ssh, f"cd {MINDEX_DIR} && {DC} rm -f mindex-postgres", "Step 4b: Remove Container")
-    
-    # Recreate with proper initialization
-    run_cmd(ssh, f"cd {MINDEX_DIR} && {DC} up -d mindex-postgres", 
-            "Step 5: Start PostgreSQL Fresh")
-    
-    print("\n[WAIT] Sleeping 15 seconds for PostgreSQL initialization...")
-    time.sleep(15)
-    
-    # Check logs
-    run_cmd(ssh, f"{DC} logs mindex-postgres --tail 30", 
-            "Step 6: PostgreSQL Startup Logs")
-    
-    # Find what user postgres is using
-    code, out = run_cmd(ssh, "docker exec mindex-postgres env | grep POSTGRES", 
-            "Step 7: PostgreSQL Environment")
-    
-    # Try to connect with default user
-    run_cmd(ssh, "docker exec mindex-postgres psql --version", 
-            "Step 8: PostgreSQL Version")
-    
-    # List databases with whatever user works
-    run_cmd(ssh, "docker exec mindex-postgres psql -l 2>&1 || docker exec mindex-postgres psql -U \$POSTGRES_USER -l 2>&1", 
-            "Step 9: List Databases")
-    
-    # Check docker-compose.yml to see what user it's configured with
-    code, out = run_cmd(ssh, f"cd {MINDEX_DIR} && cat docker-compose.yml | grep -A 10 'mindex-postgres' | grep -E 'POSTGRES_USER|POSTGRES_PASSWORD|POSTGRES_DB'", 
-            "Step 10: Docker Compose PostgreSQL Config")
-    
-    # Restart API
-    run_cmd(ssh, f"cd {MINDEX_DIR} && {DC} restart mindex-api", 
-            "Step 11: Restart MINDEX API")
-    
-    print("\n[WAIT] Sleeping 10 seconds...")
-    time.sleep(10)
-    
-    # Test health
-    run_cmd(ssh, "curl -s http://localhost:8000/api/mindex/health", 
-            "Step 12: Health Check")
-    
-    # Test stats
-    run_cmd(ssh, "curl -s http://localhost:8000/api/mindex/stats 2>&1 | head -100", 
-            "Step 13: Stats Test")
-    
-except Exception as e:
-    print(f"\n[ERROR] {e}")
-    import traceback
-    traceback.print_exc()
-finally:
-    ssh.close()
+with VMSession() as vm:
+    try:
+        # Compose flavour and container list are probed once and cached
+        print(f"[INFO] Step 1: Using command: {vm.compose_cmd}\n")
+
+        print("Step 2: Container Status")
+        vm.status()
+
+        # Check PostgreSQL env vars
+        vm.run(f"cd {MINDEX_DIR} && cat .env | grep -E 'POSTGRES|DB' || echo 'No .env file'",
+               "Step 3: Database Configuration")
+
+        if vm.container_healthy("mindex-postgres"):
+            # Transient issue: a restart keeps the page cache and skips WAL replay/initdb
+            print("\n[ACTION] PostgreSQL is healthy - restarting in place...")
+            vm.restart("mindex-postgres", desc="Steps 4-5: Restart PostgreSQL")
+        else:
+            # Stop and remove postgres to rebuild
+            print("\n[ACTION] Rebuilding PostgreSQL container...")
+            vm.compose("stop mindex-postgres", "Step 4a: Stop PostgreSQL")
+            vm.compose("rm -f mindex-postgres", "Step 4b: Remove Container")
+
+            # Recreate with proper initialization
+            vm.compose("up -d mindex-postgres", "Step 5: Start PostgreSQL Fresh")
+
+        vm.wait_until("docker exec mindex-postgres pg_isready -q", timeout=30)
+
+        # Check logs
+        vm.compose("logs mindex-postgres --tail 30", "Step 6: PostgreSQL Startup Logs")
+
+        # Steps 7-9 share one docker-exec shell into the fresh container.
+        # Find what user postgres is using
+        vm.run("env | grep POSTGRES", "Step 7: PostgreSQL Environment", container="mindex-postgres")
+
+        # Try to connect with default user
+        vm.run("psql --version", "Step 8: PostgreSQL Version", container="mindex-postgres")
+
+        # List databases with whatever user works
+        vm.run("psql -l 2>&1 || psql -U $POSTGRES_USER -l 2>&1",
+               "Step 9: List Databases", container="mindex-postgres")
+
+        # Check docker-compose.yml to see what user it's configured with
+        vm.run(f"cd {MINDEX_DIR} && cat docker-compose.yml | grep -A 10 'mindex-postgres' | grep -E 'POSTGRES_USER|POSTGRES_PASSWORD|POSTGRES_DB'",
+               "Step 10: Docker Compose PostgreSQL Config")
+
+        # Restart API
+        vm.restart("mindex-api", desc="Step 11: Restart MINDEX API")
+        vm.wait_ready()
+
+        vm.get_json("/api/mindex/health", "Step 12: Health Check")
+        vm.get_json("/api/mindex/stats", "Step 13: Stats Test", max_lines=100)
+
+    except Exception as e:
+        print(f"\n[ERROR] {e}")
+        import traceback
+        traceback.print_exc()
 
 print("\n" + "="*70)
 print("  Fix attempt complete - check output above")
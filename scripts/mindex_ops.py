@@ -0,0 +1,169 @@
+"""
+Shared session object for the MINDEX VM fix scripts.
+
+The ``fix_*`` / ``enable_postgis_*`` scripts each used to carry their own VM
+constants, ``SSHClient`` setup, ``run()`` helper and ANSI cleaner, and they
+drifted apart. ``VMSession`` wires the helpers in this directory together
+once, so every script gets the same behaviour:
+
+- ``_ssh_pool``   pooled, keep-alive SSH client
+- ``_ssh_shell``  one ``docker exec`` shell per container
+- ``_psql``       SQL uploaded over SFTP to a temp file and fed to ``psql``
+- ``_env``        cached compose flavour and container status
+- ``_wait``       readiness polling instead of fixed sleeps
+- ``_api``        API probes pretty-printed locally
+
+Usage (from a script in this directory):
+    from mindex_ops import VMSession
+
+    with VMSession() as vm:
+        vm.run_sql(SQL)
+        vm.restart("mindex-api")
+        vm.wait_ready()
+        vm.get_json("/api/mindex/stats")
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import shlex
+from typing import Any
+
+import paramiko
+
+from _api import curl_json
+from _env import container_healthy, container_status, detect_compose, print_status
+from _psql import psql_file
+from _ssh import exec_output
+from _ssh_pool import get_ssh
+from _ssh_shell import DockerShell
+from _wait import API_HEALTH_URL, wait_ready, wait_until
+
+
+VM_HOST = "192.168.0.189"
+VM_USER = "mycosoft"
+MINDEX_DIR = "/home/mycosoft/mindex"
+PG_USER = "mycosoft"
+PG_DB = "mindex"
+API_BASE = "http://localhost:8000"
+
+# Full ECMA-48 CSI grammar: SGR colours plus cursor/erase sequences.
+_ANSI_RE = re.compile(rb"\x1b\[[0-?]*[ -/]*[@-~]")
+
+
+def banner(title: str, width: int = 70) -> None:
+    """Print a step heading."""
+    print(f"\n{'=' * width}")
+    print(f"  {title}")
+    print("=" * width)
+
+
+class VMSession:
+    """Pooled SSH session to the MINDEX VM plus the common fix-script steps."""
+
+    def __init__(self, host: str = VM_HOST, user: str = VM_USER, password: str | None = None,
+                 compress: bool = False, **connect_kwargs: Any) -> None:
+        self.host = host
+        self.user = user
+        self.password = os.environ.get("VM_PASSWORD", "") if password is None else password
+        # zlib pays off for scripts that pull text-heavy output (psql listings,
+        # compose logs); it only costs CPU for the short probes the rest run.
+        self.connect_kwargs = {"compress": compress, **connect_kwargs}
+        self.ssh: paramiko.SSHClient | None = None
+        self._shells: dict[str, DockerShell] = {}
+
+    def __enter__(self) -> "VMSession":
+        if self.ssh is None:
+            self.connect()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def connect(self) -> paramiko.SSHClient:
+        print(f"\n[*] Connecting to {self.user}@{self.host}...")
+        self.ssh = get_ssh(self.host, self.user, self.password, **self.connect_kwargs)
+        print("[OK] Connected!\n")
+        return self.ssh
+
+    def close(self) -> None:
+        """Close container shells; the pooled SSH client is closed at exit."""
+        for shell in self._shells.values():
+            shell.close()
+        self._shells.clear()
+
+    def shell(self, container: str = "mindex-postgres") -> DockerShell:
+        """Return the ``docker exec`` shell for ``container``, opening it on first use."""
+        shell = self._shells.get(container)
+        if shell is None or shell._chan.closed:  # closed after a timeout
+            shell = self._shells[container] = DockerShell(self.ssh, container)
+        return shell
+
+    def run(self, cmd: str, desc: str = "", timeout: float = 120, container: str | None = None,
+            show: bool = True) -> tuple[int, str]:
+        """Run ``cmd`` on the VM (or inside ``container``); return ``(exit_code, output)``."""
+        if desc:
+            banner(desc)
+        if show:
+            print(f"$ {cmd}\n")
+        if container is not None:
+            exit_code, raw = self.shell(container).run(cmd, timeout=timeout)
+        else:
+            exit_code, raw = exec_output(self.ssh, cmd, timeout=timeout)
+        out = _ANSI_RE.sub(b"", raw).decode("utf-8", errors="replace").strip()
+        if show and out:
+            print(out + "\n")
+        return exit_code, out
+
+    def run_sql(self, sql: str, desc: str = "", db: str = PG_DB, user: str = PG_USER,
+                on_error_stop: bool = False) -> str:
+        """Upload ``sql`` and run it with one ``psql`` in mindex-postgres."""
+        with psql_file(self.ssh, sql, user, db, on_error_stop=on_error_stop) as cmd:
+            _, out = self.run(cmd, desc)
+        return out
+
+    def query(self, sql: str, db: str = PG_DB, user: str = PG_USER) -> list[list[str]]:
+        """Run one read-only query and return its rows as lists of strings."""
+        _, out = self.run(
+            f"docker exec mindex-postgres psql -U {user} -d {db} -tA -F '|' -c {shlex.quote(sql)}",
+            show=False,
+        )
+        return [line.split("|") for line in out.splitlines() if line]
+
+    @property
+    def compose_cmd(self) -> str:
+        return detect_compose(self.ssh)
+
+    def compose(self, args: str, desc: str = "", timeout: float = 120) -> tuple[int, str]:
+        """Run ``<docker compose> args`` from the MINDEX checkout."""
+        return self.run(f"cd {MINDEX_DIR} && {self.compose_cmd} {args}", desc, timeout=timeout)
+
+    def restart(self, *services: str, desc: str = "") -> tuple[int, str]:
+        """``compose restart`` the given services (all of them when none given)."""
+        return self.compose(" ".join(("restart",) + services), desc)
+
+    def status(self, refresh: bool = False) -> dict[str, str]:
+        """Print and return ``{container: status}`` for the mindex containers."""
+        return print_status(self.ssh, refresh=refresh)
+
+    def container_status(self, refresh: bool = False) -> dict[str, str]:
+        return container_status(self.ssh, refresh=refresh)
+
+    def container_healthy(self, name: str, refresh: bool = False) -> bool:
+        return container_healthy(self.ssh, name, refresh=refresh)
+
+    def wait_until(self, check: str, timeout: float = 20) -> bool:
+        return wait_until(self.ssh, check, timeout=timeout)
+
+    def wait_ready(self, path: str | None = None, timeout: float = 20,
+                   interval: float = 0.5) -> bool:
+        """Poll the API (health endpoint by default) until it answers 200."""
+        url = API_HEALTH_URL if path is None else API_BASE + path
+        return wait_ready(self.ssh, url, timeout=timeout, interval=interval)
+
+    def get_json(self, path: str, desc: str = "", max_lines: int | None = None) -> str:
+        """GET ``API_BASE + path`` and print the formatted body."""
+        if desc:
+            banner(desc)
+        return curl_json(self.ssh, API_BASE + path, max_lines=max_lines)
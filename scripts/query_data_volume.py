@@ -3,6 +3,15 @@
 MINDEX Data Volume Query Script
 ================================
 Shows comprehensive statistics about the fungal database.
+
+By default the report is read from the core.mindex_stats snapshot, which the
+full fungi sync refreshes when it finishes.
+
+Flags:
+  --json   also print the statistics as JSON
+  --live   aggregate the tables now instead of reading the snapshot
+  --exact  like --live, but count(*) the headline totals instead of using
+           planner estimates
 """
 import sys
 import json
@@ -11,193 +20,195 @@ from typing import Dict, Any
 
 sys.path.insert(0, '/app')
 
-from mindex_etl.db import db_session
+import psycopg
 
+from mindex_etl.db import STATS_VIEW, db_session
 
-def format_number(num: int) -> str:
-    """Format number with commas."""
-    return f"{num:,}"
 
+# Headline totals that can come from planner statistics instead of a scan.
+TOTAL_TABLES = {
+    "total_taxa": "core.taxon",
+    "total_external_ids": "core.taxon_external_id",
+    "genome_records": "bio.genome",
+    "trait_records": "bio.taxon_trait",
+    "synonym_records": "core.taxon_synonym",
+}
 
-def get_statistics() -> Dict[str, Any]:
-    """Get comprehensive database statistics."""
-    stats = {}
-    
+# Every statistic in one statement: one round-trip instead of twelve.
+STATS_SQL = """
+WITH obs_summary AS (
+    SELECT count(*) AS total, count(DISTINCT taxon_id) AS taxa_observed
+    FROM obs.observation
+),
+obs_dates AS (
+    -- min/max each resolve to one probe of idx_observation_observed_at
+    SELECT min(observed_at) AS earliest, max(observed_at) AS latest
+    FROM obs.observation
+),
+taxa_by_source AS (
+    SELECT coalesce(json_object_agg(source, c ORDER BY c DESC), '{}'::json) AS j
+    FROM (SELECT source, count(*) AS c FROM core.taxon GROUP BY source) s
+),
+obs_by_source AS (
+    SELECT coalesce(json_object_agg(source, c ORDER BY c DESC), '{}'::json) AS j
+    FROM (SELECT source, count(*) AS c FROM obs.observation GROUP BY source) s
+),
+top_taxa AS (
+    SELECT coalesce(json_agg(json_build_object(
+        'name', canonical_name, 'common_name', common_name, 'observations', obs_count
+    ) ORDER BY obs_count DESC), '[]'::json) AS j
+    FROM (
+        -- Aggregate one column, keep the top 10, then join only those 10 rows
+        SELECT t.canonical_name, t.common_name, c.obs_count
+        FROM (
+            SELECT taxon_id, count(*) AS obs_count
+            FROM obs.observation
+            WHERE taxon_id IS NOT NULL
+            GROUP BY taxon_id
+            ORDER BY obs_count DESC
+            LIMIT 10
+        ) c
+        JOIN core.taxon t ON t.id = c.taxon_id
+    ) top
+)
+SELECT json_build_object(
+    {totals},
+    'total_observations', o.total,
+    'taxa_by_source', (SELECT j FROM taxa_by_source),
+    'observations_by_source', (SELECT j FROM obs_by_source),
+    -- Index-only scans on the 0041 partial indexes; keep the predicates identical
+    'observations_with_location',
+        (SELECT count(*) FROM obs.observation WHERE location IS NOT NULL),
+    'observations_with_images',
+        (SELECT count(*) FROM obs.observation WHERE media <> '[]'::jsonb),
+    'taxa_with_observations', o.taxa_observed,
+    'top_taxa_by_observations', (SELECT j FROM top_taxa),
+    'observation_date_range', CASE WHEN d.earliest IS NOT NULL THEN
+        json_build_object('earliest', d.earliest, 'latest', d.latest) END
+) AS stats
+FROM obs_summary o, obs_dates d
+"""
+
+
+def _total_sql(table: str, exact: bool) -> str:
+    """Row count for ``table``: ``count(*)`` if exact, else ``pg_class.reltuples``.
+
+    The estimate is O(1) and kept current by autovacuum/ANALYZE; tables never
+    analyzed (``reltuples = -1``) still fall back to a real count.
+    """
+    if exact:
+        return f"(SELECT count(*) FROM {table})"
+    return (
+        f"(SELECT CASE WHEN c.reltuples >= 0 THEN c.reltuples::bigint "
+        f"ELSE (SELECT count(*) FROM {table}) END "
+        f"FROM pg_class c WHERE c.oid = '{table}'::regclass)"
+    )
+
+
+def get_statistics(exact: bool = False, live: bool = False) -> Dict[str, Any]:
+    """Get comprehensive database statistics.
+
+    Reads the ``core.mindex_stats`` snapshot unless ``live`` or ``exact`` is
+    set (or the view does not exist yet). Live headline totals are planner
+    estimates unless ``exact`` is set.
+    """
     with db_session() as conn:
         with conn.cursor() as cur:
-            # Total counts
-            cur.execute("SELECT count(*) FROM core.taxon")
-            stats["total_taxa"] = cur.fetchone()["count"]
-            
-            cur.execute("SELECT count(*) FROM obs.observation")
-            stats["total_observations"] = cur.fetchone()["count"]
-            
-            cur.execute("SELECT count(*) FROM core.taxon_external_id")
-            stats["total_external_ids"] = cur.fetchone()["count"]
-            
-            # Taxa by source
-            cur.execute("""
-                SELECT source, count(*) as count 
-                FROM core.taxon 
-                GROUP BY source 
-                ORDER BY count DESC
-            """)
-            stats["taxa_by_source"] = {row["source"]: row["count"] for row in cur.fetchall()}
-            
-            # Observations by source
-            cur.execute("""
-                SELECT source, count(*) as count 
-                FROM obs.observation 
-                GROUP BY source 
-                ORDER BY count DESC
-            """)
-            stats["observations_by_source"] = {row["source"]: row["count"] for row in cur.fetchall()}
-            
-            # Observations with location data
-            cur.execute("""
-                SELECT count(*) as count 
-                FROM obs.observation 
-                WHERE location IS NOT NULL
-            """)
-            stats["observations_with_location"] = cur.fetchone()["count"]
-            
-            # Observations with images
-            cur.execute("""
-                SELECT count(*) as count 
-                FROM obs.observation 
-                WHERE media IS NOT NULL 
-                AND media::text != '[]'
-            """)
-            stats["observations_with_images"] = cur.fetchone()["count"]
-            
-            # Unique taxa with observations
-            cur.execute("""
-                SELECT count(DISTINCT taxon_id) as count 
-                FROM obs.observation
-            """)
-            stats["taxa_with_observations"] = cur.fetchone()["count"]
-            
-            # Top taxa by observation count
-            cur.execute("""
-                SELECT 
-                    t.canonical_name,
-                    t.common_name,
-                    count(o.id) as obs_count
-                FROM core.taxon t
-                JOIN obs.observation o ON o.taxon_id = t.id
-                GROUP BY t.id, t.canonical_name, t.common_name
-                ORDER BY obs_count DESC
-                LIMIT 10
-            """)
-            stats["top_taxa_by_observations"] = [
-                {
-                    "name": row["canonical_name"],
-                    "common_name": row["common_name"],
-                    "observations": row["obs_count"]
-                }
-                for row in cur.fetchall()
-            ]
-            
-            # Date range of observations
-            cur.execute("""
-                SELECT 
-                    min(observed_at) as earliest,
-                    max(observed_at) as latest
-                FROM obs.observation
-                WHERE observed_at IS NOT NULL
-            """)
-            date_range = cur.fetchone()
-            if date_range and date_range["earliest"]:
-                stats["observation_date_range"] = {
-                    "earliest": date_range["earliest"].isoformat() if date_range["earliest"] else None,
-                    "latest": date_range["latest"].isoformat() if date_range["latest"] else None,
-                }
-            
-            # Genome records
-            cur.execute("SELECT count(*) FROM bio.genome")
-            stats["genome_records"] = cur.fetchone()["count"]
-            
-            # Taxon traits
-            cur.execute("SELECT count(*) FROM bio.taxon_trait")
-            stats["trait_records"] = cur.fetchone()["count"]
-            
-            # Taxon synonyms
-            cur.execute("SELECT count(*) FROM core.taxon_synonym")
-            stats["synonym_records"] = cur.fetchone()["count"]
+            stats = None
+            if not (live or exact):
+                try:
+                    cur.execute(f"SELECT stats FROM {STATS_VIEW}")
+                    row = cur.fetchone()
+                    stats = row["stats"] if row else None
+                except psycopg.errors.UndefinedTable:
+                    conn.rollback()  # migration 0042 not applied; aggregate live
+            if stats is None:
+                totals = ",\n    ".join(
+                    f"'{key}', {_total_sql(table, exact)}" for key, table in TOTAL_TABLES.items()
+                )
+                cur.execute(STATS_SQL.replace("{totals}", totals))
+                stats = cur.fetchone()["stats"]
     
+    if stats.get("observation_date_range") is None:
+        stats.pop("observation_date_range", None)
     return stats
 
 
-def print_statistics(stats: Dict[str, Any]) -> None:
-    """Print formatted statistics."""
-    print("=" * 70)
-    print("MINDEX FUNGAL DATABASE STATISTICS")
-    print("=" * 70)
-    print(f"Generated: {datetime.now().isoformat()}")
-    print()
-    
-    print("📊 CORE METRICS")
-    print("-" * 70)
-    print(f"  Total Taxa:              {format_number(stats['total_taxa'])}")
-    print(f"  Total Observations:      {format_number(stats['total_observations'])}")
-    print(f"  External ID Links:       {format_number(stats['total_external_ids'])}")
-    print()
-    
-    print("📁 DATA BY SOURCE")
-    print("-" * 70)
-    print("  Taxa:")
-    for source, count in stats["taxa_by_source"].items():
-        print(f"    {source:20} {format_number(count)}")
-    print()
-    print("  Observations:")
-    for source, count in stats["observations_by_source"].items():
-        print(f"    {source:20} {format_number(count)}")
-    print()
+def format_statistics(stats: Dict[str, Any]) -> str:
+    """Render the statistics report as one string."""
+    rule, thin = "=" * 70, "-" * 70
+    lines = [
+        rule,
+        "MINDEX FUNGAL DATABASE STATISTICS",
+        rule,
+        f"Generated: {stats.get('generated_at') or datetime.now().isoformat()}",
+        "",
+        "📊 CORE METRICS",
+        thin,
+        f"  Total Taxa:              {stats['total_taxa']:,}",
+        f"  Total Observations:      {stats['total_observations']:,}",
+        f"  External ID Links:       {stats['total_external_ids']:,}",
+        "",
+        "📁 DATA BY SOURCE",
+        thin,
+        "  Taxa:",
+        *(f"    {source:20} {count:,}" for source, count in stats["taxa_by_source"].items()),
+        "",
+        "  Observations:",
+        *(f"    {source:20} {count:,}" for source, count in stats["observations_by_source"].items()),
+        "",
+        "📍 OBSERVATION QUALITY",
+        thin,
+        f"  With Location Data:      {stats['observations_with_location']:,}",
+        f"  With Images:             {stats['observations_with_images']:,}",
+        f"  Unique Taxa Observed:    {stats['taxa_with_observations']:,}",
+        "",
+    ]
     
-    print("📍 OBSERVATION QUALITY")
-    print("-" * 70)
-    print(f"  With Location Data:      {format_number(stats['observations_with_location'])}")
-    print(f"  With Images:             {format_number(stats['observations_with_images'])}")
-    print(f"  Unique Taxa Observed:    {format_number(stats['taxa_with_observations'])}")
-    print()
-    
-    if stats.get("observation_date_range"):
-        print("📅 OBSERVATION DATE RANGE")
-        print("-" * 70)
-        date_range = stats["observation_date_range"]
+    date_range = stats.get("observation_date_range")
+    if date_range:
+        lines += ["📅 OBSERVATION DATE RANGE", thin]
         if date_range["earliest"]:
-            print(f"  Earliest: {date_range['earliest']}")
+            lines.append(f"  Earliest: {date_range['earliest']}")
         if date_range["latest"]:
-            print(f"  Latest:   {date_range['latest']}")
-        print()
+            lines.append(f"  Latest:   {date_range['latest']}")
+        lines.append("")
     
-    print("🧬 ADDITIONAL DATA")
-    print("-" * 70)
-    print(f"  Genome Records:          {format_number(stats.get('genome_records', 0))}")
-    print(f"  Trait Records:           {format_number(stats.get('trait_records', 0))}")
-    print(f"  Synonym Records:         {format_number(stats.get('synonym_records', 0))}")
-    print()
+    lines += [
+        "🧬 ADDITIONAL DATA",
+        thin,
+        f"  Genome Records:          {stats.get('genome_records', 0):,}",
+        f"  Trait Records:           {stats.get('trait_records', 0):,}",
+        f"  Synonym Records:         {stats.get('synonym_records', 0):,}",
+        "",
+    ]
     
     if stats.get("top_taxa_by_observations"):
-        print("🏆 TOP 10 TAXA BY OBSERVATIONS")
-        print("-" * 70)
+        lines += ["🏆 TOP 10 TAXA BY OBSERVATIONS", thin]
         for i, taxon in enumerate(stats["top_taxa_by_observations"], 1):
             common = f" ({taxon['common_name']})" if taxon["common_name"] else ""
-            print(f"  {i:2}. {taxon['name']:40} {common:30} {format_number(taxon['observations'])} obs")
-        print()
+            lines.append(f"  {i:2}. {taxon['name']:40} {common:30} {taxon['observations']:,} obs")
+        lines.append("")
     
-    print("=" * 70)
+    lines.append(rule)
+    return "\n".join(lines) + "\n"
+
+
+def print_statistics(stats: Dict[str, Any]) -> None:
+    """Print formatted statistics with a single write."""
+    sys.stdout.write(format_statistics(stats))
 
 
 def main():
     """Main entry point."""
     try:
-        stats = get_statistics()
-        print_statistics(stats)
+        stats = get_statistics(exact="--exact" in sys.argv, live="--live" in sys.argv)
+        report = format_statistics(stats)
         
         # Also output JSON for programmatic access
         if "--json" in sys.argv:
-            print("\n" + json.dumps(stats, indent=2, default=str))
+            report += "\n" + json.dumps(stats, indent=2, default=str) + "\n"
+        sys.stdout.write(report)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         import traceback
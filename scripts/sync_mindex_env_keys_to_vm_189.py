@@ -3,23 +3,34 @@
 Sync selected keys from local MINDEX `.env` to VM 189 `/home/mycosoft/mindex/.env`.
 
 This avoids putting secrets on the command line or in git-tracked templates.
+The merged file is pushed as a tar stream over ssh's stdin (``push_files``);
+the system ``ssh`` with ControlMaster carries every step on one multiplexed
+connection.
 
 Requires:
-  - env var VM_PASSWORD (ssh password for mycosoft@192.168.0.189)
+  - ssh access to mycosoft@192.168.0.189 (keys/agent, or env var VM_PASSWORD
+    plus ``sshpass``)
   - local file: MINDEX repo `.env` containing the keys
 """
 
 from __future__ import annotations
 
+import io
 import os
+import pickle
+import re
+import shlex
+import tarfile
+import time
 from pathlib import Path
 
-import paramiko
+from _ssh_mux import ssh_run
 
 
 VM_IP = "192.168.0.189"
 VM_USER = "mycosoft"
-REMOTE_ENV = "/home/mycosoft/mindex/.env"
+REMOTE_DIR = "/home/mycosoft/mindex"
+REMOTE_ENV = f"{REMOTE_DIR}/.env"
 
 KEYS = ("NCBI_API_KEY", "CHEMSPIDER_API_KEY")
 
@@ -35,74 +46,119 @@ def _parse_env(text: str) -> dict[str, str]:
     return out
 
 
+def _load_env_cached(path: Path) -> dict[str, str]:
+    """``_parse_env(path)``, memoised in a 0600 sidecar ``<name>.cache`` keyed by mtime and size."""
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    cache = path.with_name(path.name + ".cache")
+    try:
+        cached_key, env = pickle.loads(cache.read_bytes())
+        if cached_key == key:
+            return env
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+
+    env = _parse_env(path.read_text(encoding="utf-8", errors="ignore"))
+    tmp = cache.with_name(cache.name + f".{os.getpid()}")
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump((key, env), f)
+        os.replace(tmp, cache)
+    except OSError:
+        pass  # cache is best-effort
+    return env
+
+
+_ASSIGN_RE = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*=")
+
+
 def _upsert_lines(existing: str, updates: dict[str, str]) -> str:
-    lines = existing.splitlines()
-    seen = set()
-    for i, line in enumerate(lines):
-        if "=" not in line or line.lstrip().startswith("#"):
-            continue
-        k = line.split("=", 1)[0].strip()
-        if k in updates:
-            lines[i] = f"{k}={updates[k]}"
-            seen.add(k)
+    seen: set[str] = set()
+
+    def emit(line: str) -> str:
+        m = _ASSIGN_RE.match(line)
+        if m and m.group(1) in updates:
+            k = m.group(1)
+            seen.add(k)  # every occurrence is rewritten; dotenv readers take the last one
+            return f"{k}={updates[k]}"
+        return line
+
+    lines = [emit(line) for line in existing.splitlines()]
     # Append anything missing
-    missing = [k for k in updates.keys() if k not in seen]
+    missing = [k for k in updates if k not in seen]
     if missing:
         if lines and lines[-1].strip() != "":
             lines.append("")
         lines.append("# Synced by scripts/sync_mindex_env_keys_to_vm_189.py")
-        for k in missing:
-            lines.append(f"{k}={updates[k]}")
+        lines.extend(f"{k}={updates[k]}" for k in missing)
     return "\n".join(lines).rstrip() + "\n"
 
 
-def main() -> int:
-    vm_password = os.environ.get("VM_PASSWORD")
-    if not vm_password:
-        print("ERROR: VM_PASSWORD not set")
-        return 1
+def _tar_gz(files: dict[str, bytes], mode: int = 0o600) -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            info.mode = mode
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
 
+
+def _read_remote(path: str) -> str:
+    """Return the remote file's text, or ``""`` if it does not exist.
+
+    Any other failure (permission denied, I/O error, a directory) raises, so
+    the merge never starts from an empty file and drops the other secrets.
+    """
+    q = shlex.quote(path)
+    code, out = ssh_run(VM_IP, VM_USER, f"[ -e {q} ] || exit 0; cat {q}", timeout=60)
+    if code != 0:
+        raise RuntimeError(f"reading {path} on {VM_IP} failed ({code})")
+    return out.decode("utf-8", errors="replace")
+
+
+def push_files(files: dict[str, bytes], remote_dir: str = REMOTE_DIR) -> None:
+    """Write ``files`` ({relative path: content}) under ``remote_dir`` in one tar stream.
+
+    One ssh command carries every file, so adding more config to the sync
+    costs bandwidth rather than a round-trip per file. Files land 0600.
+    """
+    code, out = ssh_run(VM_IP, VM_USER, f"tar xzf - -C {shlex.quote(remote_dir)}",
+                        stdin=_tar_gz(files), timeout=60)
+    if code != 0:
+        raise RuntimeError(f"remote tar failed ({code}): {out.decode('utf-8', errors='replace').strip()}")
+
+
+def main() -> int:
     local_env_path = Path(__file__).resolve().parents[1] / ".env"
     if not local_env_path.exists():
         print(f"ERROR: local .env not found at {local_env_path}")
         return 1
 
-    local_env = _parse_env(local_env_path.read_text(encoding="utf-8", errors="ignore"))
+    local_env = _load_env_cached(local_env_path)
     updates = {k: local_env.get(k, "") for k in KEYS}
     missing_local = [k for k, v in updates.items() if not v]
     if missing_local:
         print(f"ERROR: missing keys in local .env: {', '.join(missing_local)}")
         return 1
 
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect(VM_IP, username=VM_USER, password=vm_password, timeout=30)
-    sftp = ssh.open_sftp()
-
-    try:
-        existing = sftp.open(REMOTE_ENV, "r").read().decode("utf-8", errors="replace")
-    except FileNotFoundError:
-        existing = ""
+    existing = _read_remote(REMOTE_ENV)
 
     new_text = _upsert_lines(existing, updates)
-    f = sftp.open(REMOTE_ENV, "w")
-    f.write(new_text.encode("utf-8"))
-    f.close()
-    sftp.close()
-
-    # Don't source `.env` (it may contain JSON values which aren't shell-safe).
-    # Just verify that the file contains the keys.
-    cmd = (
-        "cd /home/mycosoft/mindex && "
-        "python3 -c \"from pathlib import Path; "
-        "txt=Path('.env').read_text(encoding='utf-8', errors='ignore'); "
-        "print('NCBI_API_KEY_present=', ('\\nNCBI_API_KEY=' in ('\\n'+txt))); "
-        "print('CHEMSPIDER_API_KEY_present=', ('\\nCHEMSPIDER_API_KEY=' in ('\\n'+txt)));\""
-    )
-    stdin, stdout, stderr = ssh.exec_command(cmd, timeout=30)
-    print(stdout.read().decode('utf-8', errors='replace').strip())
-
-    ssh.close()
+    if new_text == existing:
+        # Idempotent re-run: nothing to write, and what we just read is current
+        print("no-op: .env already in sync")
+        txt = "\n" + existing
+    else:
+        push_files({".env": new_text.encode("utf-8")})
+        # Don't source `.env` (it may contain JSON values which aren't shell-safe).
+        # Re-read it and check for the keys here.
+        txt = "\n" + _read_remote(REMOTE_ENV)
+    for k in KEYS:
+        print(f"{k}_present=", ("\n" + k + "=") in txt)
     return 0
 
 
@@ -1,50 +1,49 @@
 #!/usr/bin/env python3
 """
 Tail VM 189 ETL log (filtered) without restarting anything.
+
+Uses the system ``ssh`` with ControlMaster, so re-running it within ten
+minutes reuses the open connection.
 """
 
 from __future__ import annotations
 
-import os
+import shlex
+import sys
 
-import paramiko
+from _ssh_mux import ssh_run
 
 
 VM_IP = "192.168.0.189"
 VM_USER = "mycosoft"
 
+NEEDLES = (
+    "mycobank",
+    "mblist",
+    "mblist.zip",
+    "mblist.xlsx",
+    "head not usable",
+    "trying get",
+    "downloaded to",
+    "failed to parse dump",
+    "openpyxl",
+    "phase 1",
+)
+
+# Filtered on the VM: case-insensitive fixed strings, so only matching lines cross the wire
+TAIL_CMD = "tail -600 /home/mycosoft/mindex/etl.log | grep -iF " + " ".join(
+    f"-e {shlex.quote(n)}" for n in NEEDLES
+)
+
 
 def main() -> int:
-    vm_password = os.environ.get("VM_PASSWORD")
-    if not vm_password:
-        print("ERROR: VM_PASSWORD not set")
+    code, out = ssh_run(VM_IP, VM_USER, TAIL_CMD, timeout=60)
+    if code == 255:
+        print("ERROR: ssh to VM failed", file=sys.stderr)
         return 1
-
-    ssh = paramiko.SSHClient()
-    ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-    ssh.connect(VM_IP, username=VM_USER, password=vm_password, timeout=30)
-
-    stdin, stdout, stderr = ssh.exec_command("tail -600 /home/mycosoft/mindex/etl.log", timeout=60)
-    text = stdout.read().decode("utf-8", errors="replace")
-    ssh.close()
-
-    needles = (
-        "mycobank",
-        "mblist",
-        "mblist.zip",
-        "mblist.xlsx",
-        "head not usable",
-        "trying get",
-        "downloaded to",
-        "failed to parse dump",
-        "openpyxl",
-        "phase 1",
-    )
-
-    for ln in text.splitlines():
-        low = ln.lower()
-        if any(n in low for n in needles):
-            print(ln)
+    text = out.decode("utf-8", errors="replace").rstrip("\n")
+    if text:
+        print(text)
 
     return 0
 
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
-from fastapi.testclient import TestClient
+import pytest
 
 from mindex_api.main import create_app
 
 
-def test_openapi_is_namespaced_under_api_prefix() -> None:
-    app = create_app()
-    client = TestClient(app)
+@pytest.fixture(scope="session")
+def app():
+    return create_app()
 
-    resp = client.get("/api/mindex/openapi.json")
-    assert resp.status_code == 200
 
-    spec = resp.json()
-    paths = spec["paths"]
+@pytest.fixture(scope="session")
+def openapi_spec(app) -> dict:
+    # app.openapi() builds and caches the schema dict; no HTTP/JSON round-trip
+    return app.openapi()
+
+
+def test_openapi_is_namespaced_under_api_prefix(app, openapi_spec) -> None:
+    assert app.openapi_url == "/api/mindex/openapi.json"
+
+    paths = openapi_spec["paths"]
 
     assert paths, "OpenAPI spec should contain paths"
     assert all(path.startswith("/api/mindex/") or path.startswith("/api/worldview/") for path in paths.keys())
@@ -31,12 +37,8 @@ def test_openapi_is_namespaced_under_api_prefix() -> None:
     assert "/api/mindex/sine/prototypes" in paths
 
 
-def test_openapi_contract_includes_stable_dto_shapes() -> None:
-    app = create_app()
-    client = TestClient(app)
-
-    spec = client.get("/api/mindex/openapi.json").json()
-    schemas = spec["components"]["schemas"]
+def test_openapi_contract_includes_stable_dto_shapes(openapi_spec) -> None:
+    schemas = openapi_spec["components"]["schemas"]
 
     # Taxa contract
     assert "TaxonListResponse" in schemas
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from typing import Any, List
-from uuid import uuid4
+import asyncio
+from collections import deque
+from types import MappingProxyType
+from typing import Any, Iterable, List
+from uuid import UUID
 
 import pytest
 from fastapi.testclient import TestClient
@@ -34,25 +37,98 @@ class FakeScalarResult:
 
 
 class FakeSession:
-    def __init__(self, responses: List[Any]):
-        self._responses = responses
+    def __init__(self, responses: Iterable[Any]):
+        self._responses = deque(responses)
 
-    async def execute(self, *_args, **_kwargs):
+    def execute(self, *_args, **_kwargs):
+        # Awaited by the routes; a completed Future resolves without a new coroutine
         if not self._responses:
             raise AssertionError("No more fake responses defined")
-        return self._responses.pop(0)
+        fut = asyncio.get_running_loop().create_future()
+        fut.set_result(self._responses.popleft())
+        return fut
+
+
+def _uuid(n: int) -> str:
+    # Deterministic ids: no urandom read, stable across runs
+    return str(UUID(int=n))
+
+
+TAXON_ID = _uuid(1)
+SAMPLE_ID = _uuid(2)
+ASSET_ID = _uuid(3)
+
+# Shared read-only rows; the fake session hands them to the routes as-is
+_TAXON_ROW = MappingProxyType({
+    "id": TAXON_ID,
+    "canonical_name": "Agaricus testus",
+    "rank": "species",
+    "common_name": "Test cap",
+    "authority": None,
+    "description": None,
+    "source": "seed",
+    "metadata": {},
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+})
+
+_TAXON_DETAIL_ROW = MappingProxyType({**_TAXON_ROW, "common_name": None, "traits": []})
+
+_TELEMETRY_ROW = MappingProxyType({
+    "device_id": _uuid(4),
+    "device_name": "Device 1",
+    "device_slug": "device-1",
+    "stream_id": _uuid(5),
+    "stream_key": "temperature",
+    "stream_unit": "C",
+    "sample_id": SAMPLE_ID,
+    "recorded_at": "2024-01-01T00:00:00Z",
+    "value_numeric": 21.5,
+    "value_text": None,
+    "value_json": None,
+    "value_unit": "C",
+    "sample_metadata": {},
+    "sample_location_geojson": None,
+    "device_location_geojson": None,
+})
+
+_IP_ASSET_ROW = MappingProxyType({
+    "id": ASSET_ID,
+    "name": "MSA",
+    "description": None,
+    "taxon_id": None,
+    "created_by": None,
+    "content_hash": None,
+    "content_uri": None,
+    "metadata": {},
+    "created_at": "2024-01-01T00:00:00Z",
+    "updated_at": "2024-01-01T00:00:00Z",
+    "hypergraph_anchors": [],
+    "bitcoin_ordinals": [],
+    "solana_bindings": [],
+})
+
+
+@pytest.fixture(scope="session")
+def _app():
+    # Built once; per-test state lives only in dependency_overrides
+    return create_app()
 
 
 @pytest.fixture
-def app():
-    app = create_app()
-    yield app
-    app.dependency_overrides.clear()
+def app(_app):
+    yield _app
+    _app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="session")
+def client(_app):
+    return TestClient(_app)
 
 
 def _db_override(responses: List[Any]):
     async def override():
-        yield FakeSession(responses.copy())
+        yield FakeSession(responses)  # builds its own deque per request
 
     return override
 
@@ -62,29 +138,11 @@ def _disable_api_key(app):
     app.dependency_overrides[require_internal_token] = lambda: "internal-test-token"
 
 
-def test_list_taxa_route(app):
+def test_list_taxa_route(app, client):
     _disable_api_key(app)
-    taxon_id = str(uuid4())
     app.dependency_overrides[get_db_session] = _db_override(
-        [
-            FakeMappingsResult([
-                {
-                    "id": taxon_id,
-                    "canonical_name": "Agaricus testus",
-                    "rank": "species",
-                    "common_name": "Test cap",
-                    "authority": None,
-                    "description": None,
-                    "source": "seed",
-                    "metadata": {},
-                    "created_at": "2024-01-01T00:00:00Z",
-                    "updated_at": "2024-01-01T00:00:00Z",
-                }
-            ]),
-            FakeScalarResult(1),
-        ]
+        [FakeMappingsResult([_TAXON_ROW]), FakeScalarResult(1)]
     )
-    client = TestClient(app)
     resp = client.get("/api/mindex/taxa")
     assert resp.status_code == 200
     payload = resp.json()
@@ -92,97 +150,30 @@ def test_list_taxa_route(app):
     assert payload["pagination"]["total"] == 1
 
 
-def test_get_taxon_route(app):
+def test_get_taxon_route(app, client):
     _disable_api_key(app)
-    taxon_id = str(uuid4())
     app.dependency_overrides[get_db_session] = _db_override(
-        [
-            FakeMappingsResult(
-                [
-                    {
-                        "id": taxon_id,
-                        "canonical_name": "Agaricus testus",
-                        "rank": "species",
-                        "common_name": None,
-                        "authority": None,
-                        "description": None,
-                        "source": "seed",
-                        "metadata": {},
-                        "created_at": "2024-01-01T00:00:00Z",
-                        "updated_at": "2024-01-01T00:00:00Z",
-                        "traits": [],
-                    }
-                ]
-            )
-        ]
+        [FakeMappingsResult([_TAXON_DETAIL_ROW])]
     )
-    client = TestClient(app)
-    resp = client.get(f"/api/mindex/taxa/{taxon_id}")
+    resp = client.get(f"/api/mindex/taxa/{TAXON_ID}")
     assert resp.status_code == 200
     assert resp.json()["canonical_name"] == "Agaricus testus"
 
 
-def test_telemetry_latest_route(app):
+def test_telemetry_latest_route(app, client):
     _disable_api_key(app)
-    sample_id = str(uuid4())
     app.dependency_overrides[get_db_session] = _db_override(
-        [
-            FakeMappingsResult(
-                [
-                    {
-                        "device_id": str(uuid4()),
-                        "device_name": "Device 1",
-                        "device_slug": "device-1",
-                        "stream_id": str(uuid4()),
-                        "stream_key": "temperature",
-                        "stream_unit": "C",
-                        "sample_id": sample_id,
-                        "recorded_at": "2024-01-01T00:00:00Z",
-                        "value_numeric": 21.5,
-                        "value_text": None,
-                        "value_json": None,
-                        "value_unit": "C",
-                        "sample_metadata": {},
-                        "sample_location_geojson": None,
-                        "device_location_geojson": None,
-                    }
-                ]
-            )
-        ]
+        [FakeMappingsResult([_TELEMETRY_ROW])]
     )
-    client = TestClient(app)
     resp = client.get("/api/mindex/telemetry/devices/latest")
     assert resp.status_code == 200
-    assert resp.json()["data"][0]["sample_id"] == sample_id
+    assert resp.json()["data"][0]["sample_id"] == SAMPLE_ID
 
 
-def test_ip_assets_list_route(app):
+def test_ip_assets_list_route(app, client):
     _disable_api_key(app)
-    asset_id = str(uuid4())
-    responses = [
-        FakeMappingsResult(
-            [
-                {
-                    "id": asset_id,
-                    "name": "MSA",
-                    "description": None,
-                    "taxon_id": None,
-                    "created_by": None,
-                    "content_hash": None,
-                    "content_uri": None,
-                    "metadata": {},
-                    "created_at": "2024-01-01T00:00:00Z",
-                    "updated_at": "2024-01-01T00:00:00Z",
-                    "hypergraph_anchors": [],
-                    "bitcoin_ordinals": [],
-                    "solana_bindings": [],
-                }
-            ]
-        ),
-        FakeScalarResult(1),
-    ]
+    responses = [FakeMappingsResult([_IP_ASSET_ROW]), FakeScalarResult(1)]
     app.dependency_overrides[get_db_session] = _db_override(responses)
-    client = TestClient(app)
     resp = client.get("/api/mindex/ip/assets")
     assert resp.status_code == 200
-    assert resp.json()["data"][0]["id"] == asset_id
+    assert resp.json()["data"][0]["id"] == ASSET_ID
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from mindex_etl import checkpoint
+
+
+def test_fast_checkpoint_persists_last_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path)
+
+    with checkpoint.FastCheckpoint("inat_taxa", flush_interval=0.01) as ckpt:
+        assert ckpt.get_last_page() is None
+        ckpt.save(41, records_processed=4100)
+        ckpt.save(42, records_processed=4200)
+
+    with checkpoint.FastCheckpoint("inat_taxa") as ckpt:
+        assert ckpt.get_last_page() == 42
+        assert ckpt.load()["metadata"] == {"records_processed": 4200, "completed": False}
+        ckpt.clear()
+        assert not ckpt.exists()
+
+
+def test_fast_checkpoint_falls_back_to_json_checkpoint(tmp_path, monkeypatch):
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path)
+    checkpoint.CheckpointManager("inat_obs").save(7, records_processed=700)
+
+    with checkpoint.FastCheckpoint("inat_obs") as ckpt:
+        assert ckpt.get_last_page() == 7
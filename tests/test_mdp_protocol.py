@@ -87,20 +87,19 @@ class TestCOBS:
         decoded = cobs_decode(encoded)
         assert decoded == data
 
-    def test_cobs_roundtrip(self):
+    @pytest.mark.parametrize("data", [
+        b"",
+        b"\x00",
+        b"Hello, World!",
+        b"\x00\x00\x00",
+        b"A\x00B\x00C",
+        bytes(range(256)),  # All byte values
+    ])
+    def test_cobs_roundtrip(self, data):
         """Encode then decode should return original data."""
-        test_cases = [
-            b"",
-            b"\x00",
-            b"Hello, World!",
-            b"\x00\x00\x00",
-            b"A\x00B\x00C",
-            bytes(range(256)),  # All byte values
-        ]
-        for data in test_cases:
-            encoded = cobs_encode(data)
-            decoded = cobs_decode(encoded)
-            assert decoded == data, f"Roundtrip failed for {data!r}"
+        encoded = cobs_encode(data)
+        decoded = cobs_decode(encoded)
+        assert decoded == data, f"Roundtrip failed for {data!r}"
 
     def test_cobs_no_zeros_in_output(self):
         """COBS encoded data should never contain zeros."""
@@ -165,17 +164,17 @@ class TestMDPFrame:
         assert not result.is_valid
         assert "too short" in result.decode_error.lower()
 
-    def test_all_message_types(self):
+    @pytest.mark.parametrize("msg_type", list(MDPMessageType))
+    def test_all_message_types(self, msg_type):
         """All message types should encode/decode correctly."""
-        for msg_type in MDPMessageType:
-            frame = encode_mdp_frame(
-                message_type=msg_type,
-                payload={"type": msg_type.name},
-                sequence_number=msg_type.value,
-            )
-            result = decode_mdp_frame(frame)
-            assert result.is_valid, f"Failed for {msg_type}"
-            assert result.message.message_type == msg_type
+        frame = encode_mdp_frame(
+            message_type=msg_type,
+            payload={"type": msg_type.name},
+            sequence_number=msg_type.value,
+        )
+        result = decode_mdp_frame(frame)
+        assert result.is_valid, f"Failed for {msg_type}"
+        assert result.message.message_type == msg_type
 
     def test_sequence_number_wrapping(self):
         """Sequence number should wrap at 16 bits."""
@@ -4,8 +4,9 @@ Tests for Mycorrhizae Protocol implementation.
 Tests channel management, message routing, and pub/sub functionality.
 """
 
+from dataclasses import FrozenInstanceError, replace
 from datetime import datetime, timezone
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 
@@ -30,6 +31,15 @@ class TestMycorrhizaeMessage:
         assert msg.message_type == "telemetry"
         assert msg.ttl_seconds == 3600
 
+    def test_message_ids_are_random_v4_uuids(self):
+        """Default ids are distinct, valid version-4 UUIDs."""
+        ids = [MycorrhizaeMessage().id for _ in range(100)]
+        assert len(set(ids)) == 100
+        for msg_id in ids:
+            assert isinstance(msg_id, UUID)
+            assert msg_id.version == 4
+            assert UUID(str(msg_id)) == msg_id
+
     def test_message_to_ndjson(self):
         """Message should serialize to valid NDJSON."""
         msg = MycorrhizaeMessage(
@@ -45,6 +55,12 @@ class TestMycorrhizaeMessage:
         assert '"temperature":24.5' in ndjson
         assert "\n" not in ndjson  # Single line
 
+    def test_message_to_ndjson_non_str_keys(self):
+        """Non-string payload keys encode as strings, as with json.dumps."""
+        msg = MycorrhizaeMessage(channel="test.channel", payload={1: 2})
+        
+        assert '"payload":{"1":2}' in msg.to_ndjson()
+
     def test_message_from_ndjson(self):
         """Message should deserialize from NDJSON."""
         original = MycorrhizaeMessage(
@@ -60,6 +76,48 @@ class TestMycorrhizaeMessage:
         assert restored.device_serial == original.device_serial
         assert restored.payload == original.payload
 
+    def test_message_serialization_cached_dict_fresh(self):
+        """NDJSON bytes are built once; to_dict hands out a new dict each call."""
+        msg = MycorrhizaeMessage(channel="test.channel", payload={"ph": 6.5})
+
+        assert msg.to_ndjson_bytes() is msg.to_ndjson_bytes()
+
+        first = msg.to_dict()
+        first["extra"] = True
+        assert "extra" not in msg.to_dict()
+
+    def test_message_is_frozen(self):
+        """Fields cannot change under the cached NDJSON; replace() makes a new copy."""
+        msg = MycorrhizaeMessage(channel="test.channel", payload={"ph": 6.5})
+        raw = msg.to_ndjson_bytes()
+
+        with pytest.raises(FrozenInstanceError):
+            msg.channel = "other.channel"
+
+        changed = replace(msg, channel="other.channel")
+        assert msg.to_ndjson_bytes() is raw
+        assert b'"channel":"other.channel"' in changed.to_ndjson_bytes()
+
+    def test_message_ndjson_bytes_roundtrip(self):
+        """Bytes form should match the str form and decode back."""
+        original = MycorrhizaeMessage(
+            channel="test.channel",
+            correlation_id=uuid4(),
+            payload={"label": "Müller", "value": None},
+        )
+
+        raw = original.to_ndjson_bytes()
+        restored = MycorrhizaeMessage.from_ndjson(raw + b"\n")
+        from_view = MycorrhizaeMessage.from_ndjson(memoryview(bytearray(raw)))
+
+        assert isinstance(raw, bytes)
+        assert raw.decode("utf-8") == original.to_ndjson()
+        assert restored.id == original.id
+        assert restored.correlation_id == original.correlation_id
+        assert restored.payload == original.payload
+        assert from_view.id == original.id
+        assert from_view.payload == original.payload
+
     def test_message_to_dict(self):
         """Message should convert to dictionary."""
         msg = MycorrhizaeMessage(
@@ -116,6 +174,18 @@ class TestMycorrhizaeChannel:
         
         assert device_id in channel.device_ids
 
+    def test_channel_accepts_last_message_at(self):
+        """last_message_at= still works as a constructor argument."""
+        seen = datetime(2026, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc)
+        channel = MycorrhizaeChannel(
+            name="test.restored",
+            channel_type=ChannelType.DEVICE,
+            last_message_at=seen,
+        )
+
+        assert channel.last_message_at == seen
+        assert channel.to_dict()["last_message_at"] == seen.isoformat()
+
 
 class TestMycorrhizaeProtocol:
     """Tests for MycorrhizaeProtocol routing."""
@@ -196,6 +266,24 @@ class TestMycorrhizaeProtocol:
         
         assert len(received) == 0
 
+    def test_unsubscribe_by_handle(self, protocol):
+        """subscribe returns a handle that removes only that subscription."""
+        received = []
+        protocol.register_channel(
+            MycorrhizaeChannel(name="test.handle", channel_type=ChannelType.DEVICE)
+        )
+        
+        first = protocol.subscribe("test.handle", lambda m: received.append(1))
+        second = protocol.subscribe("test.handle", lambda m: received.append(2), safe=True)
+        assert first and second and first != second
+        assert protocol.subscribe("nonexistent", lambda m: None) is None
+        
+        assert protocol.unsubscribe("test.handle", second) is True
+        assert protocol.unsubscribe("test.handle", second) is False
+        protocol.publish(MycorrhizaeMessage(channel="test.handle", payload={}))
+        
+        assert received == [1]
+
     def test_message_buffering(self, protocol):
         """Channel should buffer recent messages."""
         channel = MycorrhizaeChannel(
@@ -219,6 +307,21 @@ class TestMycorrhizaeProtocol:
         assert recent[0].payload["index"] == 5
         assert recent[-1].payload["index"] == 9
 
+    def test_reregister_channel_resizes_buffer(self, protocol):
+        """Re-registering with a new buffer_size keeps the newest messages."""
+        protocol.register_channel(
+            MycorrhizaeChannel(name="test.resize", channel_type=ChannelType.DEVICE, buffer_size=5)
+        )
+        for i in range(5):
+            protocol.publish(MycorrhizaeMessage(channel="test.resize", payload={"i": i}))
+        
+        protocol.register_channel(
+            MycorrhizaeChannel(name="test.resize", channel_type=ChannelType.DEVICE, buffer_size=2)
+        )
+        
+        recent = protocol.get_recent_messages("test.resize")
+        assert [m.payload["i"] for m in recent] == [3, 4]
+
     def test_channel_stats_updated(self, protocol):
         """Publishing should update channel statistics."""
         channel = MycorrhizaeChannel(
@@ -284,6 +387,66 @@ class TestMycorrhizaeProtocol:
         # Good callback still received message
         assert len(received) == 1
 
+    def test_publish_to_dark_channel_only_counts(self, protocol):
+        """A channel with no subscribers and no buffer just tracks stats."""
+        channel = MycorrhizaeChannel(
+            name="test.dark",
+            channel_type=ChannelType.DEVICE,
+            buffer_size=0,
+        )
+        protocol.register_channel(channel)
+
+        assert protocol.publish(MycorrhizaeMessage(channel="test.dark")) == 0
+        assert channel.message_count == 1
+        assert channel.last_message_at is not None
+        assert protocol.get_recent_messages("test.dark") == []
+
+    def test_safe_subscribers_and_unsubscribe_during_publish(self, protocol):
+        """Safe and guarded subscribers both fire; unsubscribing mid-fan-out is safe."""
+        received = []
+
+        channel = MycorrhizaeChannel(
+            name="test.safe",
+            channel_type=ChannelType.DEVICE,
+        )
+        protocol.register_channel(channel)
+
+        def one_shot(msg):
+            received.append("once")
+            protocol.unsubscribe("test.safe", one_shot)
+
+        protocol.subscribe("test.safe", lambda m: received.append("safe"), safe=True)
+        protocol.subscribe("test.safe", one_shot)
+        protocol.subscribe("test.safe", lambda m: received.append("guarded"))
+
+        assert protocol.publish(MycorrhizaeMessage(channel="test.safe")) == 3
+        assert received == ["safe", "once", "guarded"]
+
+        assert protocol.publish(MycorrhizaeMessage(channel="test.safe")) == 2
+        assert received[3:] == ["safe", "guarded"]
+
+    def test_safe_and_guarded_subscribers_keep_registration_order(self, protocol):
+        """safe=True skips the guard but not the queue: delivery follows subscribe order."""
+        received = []
+
+        channel = MycorrhizaeChannel(
+            name="test.order",
+            channel_type=ChannelType.DEVICE,
+        )
+        protocol.register_channel(channel)
+
+        def failing(msg):
+            received.append("failing")
+            raise RuntimeError("boom")
+
+        protocol.subscribe("test.order", lambda m: received.append("guarded-1"))
+        protocol.subscribe("test.order", lambda m: received.append("safe-1"), safe=True)
+        protocol.subscribe("test.order", failing)
+        protocol.subscribe("test.order", lambda m: received.append("safe-2"), safe=True)
+
+        assert protocol.publish(MycorrhizaeMessage(channel="test.order")) == 4
+        assert received == ["guarded-1", "safe-1", "failing", "safe-2"]
+
 
 class TestChannelFactories:
     """Tests for channel factory methods."""
@@ -1,31 +1,37 @@
 from __future__ import annotations
 
+import json
+
 import httpx
 from unittest.mock import patch
 
 from mindex_etl.config import settings
 from mindex_etl.sources import inat
 
+# Response bodies encoded once; each test only wraps them in fresh httpx.Responses
+_JSON_HEADERS = {"content-type": "application/json"}
+_TAXA_PAGE1 = json.dumps({
+    "results": [
+        {
+            "id": 1,
+            "name": "Agaricus",
+            "rank": "species",
+            "preferred_common_name": "Field mushroom",
+            "wikipedia_summary": "Summary",
+        }
+    ]
+}).encode()
+_EMPTY_PAGE = b'{"results":[]}'
+
+
 def test_iter_fungi_taxa_handles_pagination(tmp_path, monkeypatch):
     monkeypatch.setattr(settings, "local_data_dir", str(tmp_path))
-    page1 = {
-        "results": [
-            {
-                "id": 1,
-                "name": "Agaricus",
-                "rank": "species",
-                "preferred_common_name": "Field mushroom",
-                "wikipedia_summary": "Summary",
-            }
-        ]
-    }
-    page2 = {"results": []}
     
     with patch("httpx.Client.get") as mock_get:
         req = httpx.Request("GET", "https://api.inaturalist.org")
         mock_get.side_effect = [
-            httpx.Response(200, json=page1, request=req),
-            httpx.Response(200, json=page2, request=req)
+            httpx.Response(200, content=_TAXA_PAGE1, headers=_JSON_HEADERS, request=req),
+            httpx.Response(200, content=_EMPTY_PAGE, headers=_JSON_HEADERS, request=req)
         ]
         rows = list(inat.iter_fungi_taxa(per_page=1, max_pages=2, delay_seconds=0))
     assert len(rows) == 1
@@ -33,3 +39,50 @@ def test_iter_fungi_taxa_handles_pagination(tmp_path, monkeypatch):
     assert taxon["canonical_name"] == "Agaricus"
     assert source == "inat"
     assert external_id == "1"
+
+
+async def test_aiter_inat_taxa_pages_fetches_remaining_pages_in_order():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        seen.append(page)
+        return httpx.Response(200, json={
+            "total_results": 5,
+            "results": [{"id": page, "name": f"Taxon {page}", "rank": "species"}],
+        })
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        pages = [
+            item
+            async for item in inat.aiter_inat_taxa_pages(
+                per_page=1, concurrency=3, requests_per_minute=0,
+                client=client, save_locally=False,
+            )
+        ]
+
+    assert [page for page, _ in pages] == [1, 2, 3, 4, 5]
+    assert sorted(seen) == [1, 2, 3, 4, 5]
+    assert pages[2][1][0][2] == "3"
+
+
+async def test_aiter_inat_taxa_pages_max_pages_counts_from_start_page(monkeypatch):
+    monkeypatch.setattr(settings, "inat_rate_limit", 0)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params["page"])
+        return httpx.Response(200, json={
+            "total_results": 10,
+            "results": [{"id": page, "name": f"Taxon {page}", "rank": "species"}],
+        })
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        pages = [
+            page
+            async for page, _ in inat.aiter_inat_taxa_pages(
+                per_page=1, max_pages=3, start_page=4,
+                client=client, save_locally=False,
+            )
+        ]
+
+    assert pages == [4, 5, 6]
@@ -77,64 +77,38 @@ def test_insert_telemetry_and_query_latest_samples(conn):
         )
         taxon_id = cur.fetchone()["id"]
 
+        # Device, stream and sample in one round-trip, as the ingest path does
         cur.execute(
             """
-            INSERT INTO telemetry.device (name, slug, taxon_id, location)
-            VALUES (
-                %s,
-                %s,
-                %s,
-                ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography
+            WITH d AS (
+                INSERT INTO telemetry.device (name, slug, taxon_id, location)
+                VALUES (%(name)s, %(slug)s, %(taxon_id)s, ST_SetSRID(ST_MakePoint(%(lng)s, %(lat)s), 4326)::geography)
+                RETURNING id
+            ), s AS (
+                INSERT INTO telemetry.stream (device_id, key, unit, description)
+                SELECT id, 'temperature', 'C', 'Air temp stream' FROM d
+                RETURNING id
+            ), smp AS (
+                INSERT INTO telemetry.sample (stream_id, recorded_at, value_numeric, value_unit, location)
+                SELECT id, %(recorded_at)s, %(value)s, 'C',
+                       ST_SetSRID(ST_MakePoint(%(lng)s, %(lat)s), 4326)::geography
+                FROM s
+                RETURNING id
             )
-            RETURNING id
-            """,
-            (
-                f"Device-{uuid4()}",
-                f"device-{uuid4()}",
-                taxon_id,
-                -122.33,
-                47.6,
-            ),
-        )
-        device_id = cur.fetchone()["id"]
-
-        cur.execute(
-            """
-            INSERT INTO telemetry.stream (device_id, key, unit, description)
-            VALUES (%s, 'temperature', 'C', 'Air temp stream')
-            RETURNING id
-            """,
-            (device_id,),
-        )
-        stream_id = cur.fetchone()["id"]
-
-        cur.execute(
-            """
-            INSERT INTO telemetry.sample (
-                stream_id,
-                recorded_at,
-                value_numeric,
-                value_unit,
-                location
-            )
-            VALUES (
-                %s,
-                %s,
-                %s,
-                'C',
-                ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography
-            )
-            RETURNING id
+            SELECT d.id AS device_id, s.id AS stream_id, smp.id AS sample_id FROM d, s, smp
             """,
-            (
-                stream_id,
-                recorded_at,
-                21.5,
-                -122.33,
-                47.6,
-            ),
+            {
+                "name": f"Device-{uuid4()}",
+                "slug": f"device-{uuid4()}",
+                "taxon_id": taxon_id,
+                "lng": -122.33,
+                "lat": 47.6,
+                "recorded_at": recorded_at,
+                "value": 21.5,
+            },
         )
-        sample_id = cur.fetchone()["id"]
+        ids = cur.fetchone()
+        device_id, stream_id, sample_id = ids["device_id"], ids["stream_id"], ids["sample_id"]
 
         cur.execute(
             """
@@ -155,3 +129,122 @@ def test_insert_telemetry_and_query_latest_samples(conn):
         cur.execute("DELETE FROM telemetry.stream WHERE id = %s", (stream_id,))
         cur.execute("DELETE FROM telemetry.device WHERE id = %s", (device_id,))
         cur.execute("DELETE FROM core.taxon WHERE id = %s", (taxon_id,))
+
+
+
+async def test_upsert_telemetry_samples_inserts_then_reuses_streams(conn):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from mindex_api.routers.mycobrain import _upsert_telemetry_samples
+
+    first_at = datetime.now(timezone.utc)
+    second_at = first_at + timedelta(seconds=5)
+    with conn.cursor() as cur:
+        cur.execute(
+            "INSERT INTO telemetry.device (name, slug) VALUES (%s, %s) RETURNING id",
+            (f"Device-{uuid4()}", f"device-{uuid4()}"),
+        )
+        device_id = cur.fetchone()["id"]
+
+    engine = create_async_engine(DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1))
+    try:
+        async with AsyncSession(engine) as session:
+            await _upsert_telemetry_samples(
+                session, device_id, first_at,
+                {"temperature": 21.5, "humidity": None, "pressure": 1012},
+            )
+            await _upsert_telemetry_samples(session, device_id, second_at, {"temperature": 22.0})
+            await session.commit()
+
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT st.key, sa.recorded_at, sa.value_numeric
+                FROM telemetry.stream st
+                JOIN telemetry.sample sa ON sa.stream_id = st.id
+                WHERE st.device_id = %s
+                ORDER BY st.key, sa.recorded_at
+                """,
+                (device_id,),
+            )
+            rows = [(r["key"], r["recorded_at"], r["value_numeric"]) for r in cur.fetchall()]
+            cur.execute("SELECT count(*) AS n FROM telemetry.stream WHERE device_id = %s", (device_id,))
+            stream_count = cur.fetchone()["n"]
+
+        # None readings are skipped; the second push reuses the temperature stream
+        assert stream_count == 2
+        assert [(key, value) for key, _, value in rows] == [
+            ("pressure", 1012.0),
+            ("temperature", 21.5),
+            ("temperature", 22.0),
+        ]
+        assert abs(rows[-1][1] - second_at) < timedelta(seconds=1)
+    finally:
+        await engine.dispose()
+        with conn.cursor() as cur:
+            # Streams and samples cascade from the device
+            cur.execute("DELETE FROM telemetry.device WHERE id = %s", (device_id,))
+
+def test_ewkb_point_matches_postgis_encoding():
+    from mindex_etl.observation_copy import ewkb_point
+
+    # ST_AsEWKB('SRID=4326;POINT(1 2)'::geometry), little-endian
+    assert ewkb_point(1.0, 2.0).upper() == "0101000020E6100000000000000000F03F0000000000000040"
+    assert ewkb_point(None, 2.0) is None
+
+
+def test_observation_copy_writer_merges_batches(conn):
+    from mindex_etl.observation_copy import ObservationCopyWriter
+
+    source_id = f"copy-test-{uuid4()}"
+    obs = {
+        "source": "copy_test",
+        "source_id": source_id,
+        "observer": "first",
+        "observed_at": datetime.now(timezone.utc).isoformat(),
+        "lat": 45.0,
+        "lng": -122.0,
+        "photos": [{"url": "https://example.org/a.jpg"}],
+        "metadata": {"quality_grade": "research"},
+    }
+    try:
+        writer = ObservationCopyWriter(conn, batch_size=10, on_conflict="update")
+        writer.add(obs, taxon_id=None)
+        writer.add({**obs, "observer": "second"}, taxon_id=None)
+        assert writer.flush() == 1
+
+        skip = ObservationCopyWriter(conn, on_conflict="nothing")
+        skip.add({**obs, "observer": "third"}, taxon_id=None)
+        assert skip.flush() == 0
+
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT observer, location IS NOT NULL AS has_location FROM obs.observation "
+                "WHERE source = 'copy_test' AND source_id = %s",
+                (source_id,),
+            )
+            row = cur.fetchone()
+        assert row == {"observer": "second", "has_location": True}
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM obs.observation WHERE source = 'copy_test' AND source_id = %s", (source_id,))
+
+
+def test_observation_copy_writer_keeps_rows_without_source_id(conn):
+    from mindex_etl.observation_copy import ObservationCopyWriter
+
+    observer = f"copy-test-{uuid4()}"
+    obs = {
+        "source": "copy_test",
+        "source_id": None,
+        "observer": observer,
+        "observed_at": datetime.now(timezone.utc).isoformat(),
+    }
+    try:
+        writer = ObservationCopyWriter(conn, batch_size=10)
+        writer.add(obs, taxon_id=None)
+        writer.add(obs, taxon_id=None)
+        assert writer.flush() == 2
+    finally:
+        with conn.cursor() as cur:
+            cur.execute("DELETE FROM obs.observation WHERE source = 'copy_test' AND observer = %s", (observer,))
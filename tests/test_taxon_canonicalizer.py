@@ -12,3 +12,9 @@ def test_normalize_name_trims_whitespace():
 def test_normalize_name_raises_for_empty():
     with pytest.raises(ValueError):
         normalize_name(" ")
+
+
+def test_normalize_name_is_cached():
+    first = normalize_name("Amanita  muscaria")
+    assert normalize_name("Amanita  muscaria") is first
+    assert normalize_name.cache_info().hits >= 1